@@ -61,13 +61,13 @@ def remove_low_observation_tickers(df, min_obs):
         print(f"\nRecords to be removed: {len(records_to_remove)}")
         
         # Filter out low-observation tickers
-        df_filtered = df[~df['Ticker'].isin(low_obs_tickers.index)].copy()
+        df_filtered = df[~df['Ticker'].isin(low_obs_tickers.index)]
         
         print(f"Records after filtering: {len(df_filtered)}")
         print(f"Tickers after filtering: {df_filtered['Ticker'].nunique()}")
     else:
         print(f"✅ No tickers found with < {min_obs} observations")
-        df_filtered = df.copy()
+        df_filtered = df
     
     return df_filtered
 
@@ -94,7 +94,7 @@ def remove_missing_values(df, required_cols):
         print(sample_missing[['Ticker', 'signal_date', 'return_date'] + required_cols])
         
         # Drop rows with missing values
-        df_cleaned = df.dropna(subset=required_cols).copy()
+        df_cleaned = df.dropna(subset=required_cols)
         
         print(f"\nRecords after removing missing values: {len(df_cleaned)}")
         print(f"Records removed: {len(df) - len(df_cleaned)}")
@@ -108,7 +108,7 @@ def remove_missing_values(df, required_cols):
             print(missing_after[missing_after > 0])
     else:
         print("\n✅ No missing values found in critical columns")
-        df_cleaned = df.copy()
+        df_cleaned = df
     
     return df_cleaned
 
@@ -12,10 +12,15 @@ Outputs: PNG files saved to ../results/Figures/
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; figures are only saved to disk
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import os
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
@@ -705,6 +710,20 @@ def create_results_dashboard():
 # MAIN EXECUTION
 # ============================================================
 
+def capture_plot_output(plot_function, *args):
+    """Run one plot function in a worker and return what it printed"""
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        plot_function(*args)
+    return output.getvalue()
+
+
+def run_plots(executor, tasks):
+    """Render (plot_function, *args) tasks in the worker pool and print their output in task order"""
+    futures = [executor.submit(capture_plot_output, plot_function, *args) for plot_function, *args in tasks]
+    for future in futures:
+        print(future.result(), end='')  # re-raises any error from the worker
+
+
 def main():
     print("\n" + "="*60)
     print("CREATING VISUALIZATIONS FOR CAMPUS CHALLENGE")
@@ -712,34 +731,41 @@ def main():
     
     ensure_output_dir()
     
-    # 1. Portfolio Performance Charts
-    print("📊 Creating portfolio performance charts...")
-    for config in CONFIGS:
-        plot_cumulative_returns_single_config(config)
-        plot_drawdown(config)
-        plot_rolling_sharpe(config)
-    
-    plot_cumulative_returns_all_configs()
-    plot_performance_summary()
-    
-    # 2. Factor Model Charts
-    print("\n📈 Creating factor model charts...")
-    plot_alpha_comparison()
-    plot_r_squared_comparison()
-    plot_factor_exposures()
-    plot_alpha_vs_transaction_costs()
-    
-    # 3. Fama-MacBeth Charts
-    print("\n🔍 Creating Fama-MacBeth charts...")
-    for config in ['monthly', 'weekly']:
-        plot_fama_macbeth_slopes(config)
-        plot_fama_macbeth_distribution(config)
-    
-    plot_fama_macbeth_comparison()
-    
-    # 4. Summary Dashboard
-    print("\n🎯 Creating summary dashboard...")
-    create_results_dashboard()
+    # Each chart reads its own inputs and writes its own PNG, so charts are rendered in
+    # separate processes (Agg rendering and PNG encoding are CPU-bound)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # 1. Portfolio Performance Charts
+        print("📊 Creating portfolio performance charts...")
+        portfolio_tasks = []
+        for config in CONFIGS:
+            portfolio_tasks += [
+                (plot_cumulative_returns_single_config, config),
+                (plot_drawdown, config),
+                (plot_rolling_sharpe, config),
+            ]
+        portfolio_tasks += [(plot_cumulative_returns_all_configs,), (plot_performance_summary,)]
+        run_plots(executor, portfolio_tasks)
+        
+        # 2. Factor Model Charts
+        print("\n📈 Creating factor model charts...")
+        run_plots(executor, [
+            (plot_alpha_comparison,),
+            (plot_r_squared_comparison,),
+            (plot_factor_exposures,),
+            (plot_alpha_vs_transaction_costs,),
+        ])
+        
+        # 3. Fama-MacBeth Charts
+        print("\n🔍 Creating Fama-MacBeth charts...")
+        fmb_tasks = []
+        for config in ['monthly', 'weekly']:
+            fmb_tasks += [(plot_fama_macbeth_slopes, config), (plot_fama_macbeth_distribution, config)]
+        fmb_tasks.append((plot_fama_macbeth_comparison,))
+        run_plots(executor, fmb_tasks)
+        
+        # 4. Summary Dashboard
+        print("\n🎯 Creating summary dashboard...")
+        run_plots(executor, [(create_results_dashboard,)])
     
     print(f"\n{'='*60}")
     print("✅ ALL VISUALIZATIONS CREATED SUCCESSFULLY!")
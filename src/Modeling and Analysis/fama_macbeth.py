@@ -109,59 +109,59 @@ def assign_rebalancing_periods(df, freq='M'):
     return df
 
 
-def run_cross_sectional_regression(period_data, signal_col='composite_signal'):
+def run_cross_sectional_regressions(df, signal_col='composite_signal', min_obs=10):
     """
-    Run cross-sectional regression for one period.
+    Run the cross-sectional regression for every rebalancing period at once.
     
     R_{i,t+1} = a_t + b_t × Signal_{i,t} + ε_{i,t+1}
     
+    With a single regressor, OLS reduces to per-period sums of the demeaned signal and
+    return, so all periods come from a few grouped sums instead of one model fit each.
+    
     Args:
-        period_data: DataFrame with signal and forward return for this period
+        df: DataFrame with 'rebal_period', signal and forward return columns
         signal_col: column name for signal
+        min_obs: minimum observations for a period to be regressed
     
     Returns:
-        Dictionary with regression results
+        DataFrame indexed by rebal_period (sorted) with intercept, slope,
+        t_stat, r_squared and n_obs; periods with too few observations or a constant
+        signal (no slope to estimate) are left out
     """
-    # Check if we have required columns
-    if signal_col not in period_data.columns:
-        return None
-    
-    if 'forward_return' not in period_data.columns:
-        return None
+    columns = ['intercept', 'slope', 't_stat', 'r_squared', 'n_obs']
+    if signal_col not in df.columns or 'forward_return' not in df.columns:
+        return pd.DataFrame(columns=columns)
     
     # Drop missing values
-    valid_data = period_data[[signal_col, 'forward_return']].dropna()
-    
-    if len(valid_data) < 10:  # Need minimum observations
-        return None
-    
-    # Prepare regression
-    y = valid_data['forward_return']
-    X = valid_data[[signal_col]]
-    X = sm.add_constant(X)
+    valid_data = df[['rebal_period', signal_col, 'forward_return']].dropna()
+    
+    grouped = valid_data.groupby('rebal_period', sort=True)
+    n_obs = grouped.size()
+    means = grouped[[signal_col, 'forward_return']].transform('mean')
+    dx = valid_data[signal_col] - means[signal_col]
+    dy = valid_data['forward_return'] - means['forward_return']
+    period = valid_data['rebal_period']
+    
+    sxx = (dx * dx).groupby(period, sort=True).sum()
+    sxy = (dx * dy).groupby(period, sort=True).sum()
+    syy = (dy * dy).groupby(period, sort=True).sum()
+    slope = sxy / sxx
+    
+    # Residual sum of squares from the residuals themselves (more accurate than syy - slope*sxy)
+    resid = dy - slope.reindex(period).to_numpy() * dx
+    ssr = (resid * resid).groupby(period, sort=True).sum()
+    
+    mean_x = grouped[signal_col].mean()
+    mean_y = grouped['forward_return'].mean()
+    results = pd.DataFrame({
+        'intercept': mean_y - slope * mean_x,
+        'slope': slope,
+        't_stat': slope / np.sqrt(ssr / (n_obs - 2) / sxx),
+        'r_squared': 1 - ssr / syy,
+        'n_obs': n_obs,
+    })
     
-    try:
-        # Run OLS
-        model = OLS(y, X)
-        results = model.fit()
-        
-        # Extract results
-        intercept = results.params[0]
-        slope = results.params[1]
-        t_stat = results.tvalues[1]
-        r_squared = results.rsquared
-        n_obs = len(valid_data)
-        
-        return {
-            'intercept': intercept,
-            'slope': slope,
-            't_stat': t_stat,
-            'r_squared': r_squared,
-            'n_obs': n_obs
-        }
-    except Exception as e:
-        print(f"    Warning: Regression failed - {e}")
-        return None
+    return results[(results['n_obs'] >= min_obs) & (sxx > 0)]
 
 
 def fama_macbeth_analysis(df, config_name, freq='M', signal_col='composite_signal'):
@@ -191,27 +191,21 @@ def fama_macbeth_analysis(df, config_name, freq='M', signal_col='composite_signa
     print(f"  Last period: {periods[-1]}")
     
     # Run cross-sectional regression for each period
-    results = []
+    results_df = run_cross_sectional_regressions(df, signal_col)
     
-    for period in periods:
-        period_data = df[df['rebal_period'] == period]
-        
-        result = run_cross_sectional_regression(period_data, signal_col)
-        
-        if result is not None:
-            result['period'] = str(period)
-            result['date'] = period.to_timestamp()
-            results.append(result)
-            
-            # Print progress every 5 periods
-            if len(results) % 5 == 0:
-                print(f"    Processed {len(results)} periods... Latest slope: {result['slope']:.6f} (t={result['t_stat']:.2f})")
-    
-    if not results:
+    # Print progress every 5 periods
+    for count, (slope, t_stat) in enumerate(zip(results_df['slope'], results_df['t_stat']), start=1):
+        if count % 5 == 0:
+            print(f"    Processed {count} periods... Latest slope: {slope:.6f} (t={t_stat:.2f})")
+    
+    if results_df.empty:
         print("  ERROR: No valid cross-sectional regressions")
         return None
     
-    results_df = pd.DataFrame(results)
+    period_index = pd.PeriodIndex(results_df.index)
+    results_df = results_df.reset_index(drop=True)
+    results_df['period'] = period_index.astype(str)
+    results_df['date'] = period_index.to_timestamp()
     
     print(f"\n  ✓ Completed {len(results_df)} cross-sectional regressions")
     print(f"  Mean slope: {results_df['slope'].mean():.6f}")
@@ -33,6 +33,9 @@ SHORT_PERCENTILE = 20  # Bottom 20% for short
 MIN_TICKERS_PER_REBALANCE = 20  # Minimum stocks needed for portfolio formation
 RISK_FREE_RATE = 0.0  # Annual risk-free rate (0% for now; update if you get RF data)
 
+# Panel columns used by the backtest (everything else is skipped at load time)
+PANEL_COLUMNS = ['Ticker', 'signal_date', 'return_date', 'signal_score', 'RET', 'MV_USD_lag']
+
 # Configurations to run (will loop through these)
 REBALANCE_FREQUENCIES = ['monthly', 'weekly']
 WEIGHTING_SCHEMES = ['equal', 'value']
@@ -41,11 +44,9 @@ WEIGHTING_SCHEMES = ['equal', 'value']
 def load_panel():
     """Load the cleaned signal-return panel"""
     print("Loading cleaned signal-return panel...")
-    df = pd.read_csv(PANEL_FILE)
-    
-    # Convert dates
-    df['signal_date'] = pd.to_datetime(df['signal_date'])
-    df['return_date'] = pd.to_datetime(df['return_date'])
+    # Dates are parsed while reading; cache_dates converts each distinct date string once
+    df = pd.read_csv(PANEL_FILE, usecols=PANEL_COLUMNS,
+                     parse_dates=['signal_date', 'return_date'], cache_dates=True)
     
     print(f"  Records: {len(df):,}")
     print(f"  Tickers: {df['Ticker'].nunique()}")
@@ -107,32 +108,32 @@ def form_portfolios(agg_signals, long_pct, short_pct, min_tickers):
     """
     print(f"\nForming portfolios (top {100-long_pct:.0f}% long, bottom {short_pct:.0f}% short)...")
     
-    portfolio_members = []
-    skipped_periods = 0
+    # Number of tickers with a signal in each row's rebalance period
+    period_sizes = agg_signals.groupby('rebalance_period')['signal_score'].transform('size')
     
-    for period in agg_signals['rebalance_period'].unique():
-        period_data = agg_signals[agg_signals['rebalance_period'] == period].copy()
-        
-        # Check minimum ticker requirement
-        if len(period_data) < min_tickers:
-            skipped_periods += 1
-            continue
-        
-        # Rank by signal score
-        period_data['rank_pct'] = period_data['signal_score'].rank(pct=True) * 100
-        
-        # Long: top percentile
-        long_members = period_data[period_data['rank_pct'] >= long_pct].copy()
-        long_members['position'] = 'long'
-        
-        # Short: bottom percentile
-        short_members = period_data[period_data['rank_pct'] <= short_pct].copy()
-        short_members['position'] = 'short'
-        
-        portfolio_members.append(long_members)
-        portfolio_members.append(short_members)
+    # Check minimum ticker requirement
+    eligible = period_sizes >= min_tickers
+    skipped_periods = agg_signals.loc[~eligible, 'rebalance_period'].nunique()
+    period_data = agg_signals[eligible]
+    
+    # Rank by signal score within each period
+    period_data = period_data.assign(
+        rank_pct=period_data.groupby('rebalance_period')['signal_score'].rank(pct=True) * 100
+    )
+    
+    # Long: top percentile; Short: bottom percentile
+    long_members = period_data[period_data['rank_pct'] >= long_pct].assign(position='long')
+    short_members = period_data[period_data['rank_pct'] <= short_pct].assign(position='short')
     
-    portfolio_df = pd.concat(portfolio_members, ignore_index=True)
+    # Same row order as forming one period at a time: periods in order of appearance,
+    # each period's longs before its shorts
+    members = pd.concat([long_members, short_members])
+    period_codes = pd.factorize(agg_signals['rebalance_period'])[0]
+    member_order = np.lexsort((
+        (members['position'] == 'short').to_numpy(),
+        period_codes[agg_signals.index.get_indexer(members.index)],
+    ))
+    portfolio_df = members.iloc[member_order].reset_index(drop=True)
     
     print(f"  Valid rebalance periods: {portfolio_df['rebalance_period'].nunique()}")
     print(f"  Skipped periods (< {min_tickers} tickers): {skipped_periods}")
@@ -208,56 +209,37 @@ def compute_portfolio_returns(portfolio_df, returns_df):
     # For daily returns, we need to know which rebalance period each return_date belongs to
     # Map each return_date to the most recent rebalance_period
     
-    # Get all rebalance dates
-    rebalance_dates = sorted(portfolio_df['rebalance_period'].unique())
-    
-    # For each return in the panel, find which rebalance period it belongs to
-    returns_with_weights = []
-    
-    for ticker in returns_df['Ticker'].unique():
-        ticker_returns = returns_df[returns_df['Ticker'] == ticker].copy()
-        ticker_weights = portfolio_weights[portfolio_weights['Ticker'] == ticker].copy()
-        
-        if len(ticker_weights) == 0:
-            continue  # Ticker never in portfolio
-        
-        # For each return_date, find the applicable rebalance_period
-        # (most recent rebalance_period <= return_date)
-        for idx, row in ticker_returns.iterrows():
-            return_date = row['return_date']
-            
-            # Find the rebalance period this return belongs to
-            applicable_rebalances = [rb for rb in rebalance_dates if rb <= return_date]
-            
-            if len(applicable_rebalances) == 0:
-                continue  # Return is before first rebalance
-            
-            current_rebalance = applicable_rebalances[-1]  # Most recent rebalance
-            
-            # Get weight for this ticker in this rebalance period
-            ticker_weight_row = ticker_weights[ticker_weights['rebalance_period'] == current_rebalance]
-            
-            if len(ticker_weight_row) == 0:
-                continue  # Ticker not in portfolio for this period
-            
-            returns_with_weights.append({
-                'return_date': return_date,
-                'Ticker': ticker,
-                'RET': row['RET'],
-                'position': ticker_weight_row.iloc[0]['position'],
-                'weight': ticker_weight_row.iloc[0]['weight'],
-                'rebalance_period': current_rebalance
-            })
-    
-    weighted_returns = pd.DataFrame(returns_with_weights)
+    # Sort the rebalance dates once; each return's applicable rebalance_period
+    # (most recent rebalance_period <= return_date) is then a binary search
+    rebalance_dates = pd.DatetimeIndex(portfolio_df['rebalance_period'].unique()).sort_values()
+    rebalance_idx = rebalance_dates.searchsorted(returns_df['return_date'], side='right') - 1
+    after_first_rebalance = rebalance_idx >= 0  # returns before the first rebalance are skipped
+    
+    # Keep the original row order: tickers in order of first appearance, then panel order
+    ticker_codes = pd.factorize(returns_df['Ticker'])[0][after_first_rebalance]
+    returns_in_scope = returns_df.loc[after_first_rebalance, ['return_date', 'Ticker', 'RET']].assign(
+        rebalance_period=rebalance_dates[rebalance_idx[after_first_rebalance]]
+    ).iloc[np.argsort(ticker_codes, kind='stable')]
+    
+    # Attach the ticker's weight and position for that period
+    # (returns of tickers not in the portfolio for that period are dropped)
+    weighted_returns = returns_in_scope.merge(
+        portfolio_weights.drop_duplicates(['Ticker', 'rebalance_period']),
+        on=['Ticker', 'rebalance_period'],
+        how='inner',
+    )[['return_date', 'Ticker', 'RET', 'position', 'weight', 'rebalance_period']]
     
     print(f"  Weighted return observations: {len(weighted_returns)}")
     
     # Compute portfolio returns for each date and position
     # Portfolio return = sum of (weight * return) for all constituents
-    daily_portfolio_returns = weighted_returns.groupby(['return_date', 'position']).apply(
-        lambda x: (x['weight'] * x['RET']).sum()
-    ).reset_index(name='portfolio_return')
+    # (weighted contributions are formed once, then summed per group without building sub-DataFrames)
+    daily_portfolio_returns = (
+        (weighted_returns['weight'] * weighted_returns['RET'])
+        .groupby([weighted_returns['return_date'], weighted_returns['position']])
+        .sum()
+        .reset_index(name='portfolio_return')
+    )
     
     # Pivot to have Long and Short as columns
     daily_returns_wide = daily_portfolio_returns.pivot(
@@ -348,6 +330,13 @@ def calculate_turnover(portfolio_df):
     
     rebalance_dates = sorted(portfolio_df['rebalance_period'].unique())
     
+    # Holdings (Ticker -> weight) for each (rebalance_period, position)
+    empty_portfolio = pd.DataFrame({'weight': []}, index=pd.Index([], name='Ticker'))
+    holdings = {
+        key: group[['Ticker', 'weight']].set_index('Ticker')
+        for key, group in portfolio_df.groupby(['rebalance_period', 'position'])
+    }
+    
     turnovers = []
     
     for i in range(1, len(rebalance_dates)):
@@ -355,24 +344,11 @@ def calculate_turnover(portfolio_df):
         curr_date = rebalance_dates[i]
         
         for position in ['long', 'short']:
-            prev_portfolio = portfolio_df[
-                (portfolio_df['rebalance_period'] == prev_date) & 
-                (portfolio_df['position'] == position)
-            ][['Ticker', 'weight']].set_index('Ticker')
+            prev_portfolio = holdings.get((prev_date, position), empty_portfolio)
+            curr_portfolio = holdings.get((curr_date, position), empty_portfolio)
             
-            curr_portfolio = portfolio_df[
-                (portfolio_df['rebalance_period'] == curr_date) & 
-                (portfolio_df['position'] == position)
-            ][['Ticker', 'weight']].set_index('Ticker')
-            
-            # Align and compute weight changes
-            all_tickers = set(prev_portfolio.index).union(set(curr_portfolio.index))
-            
-            weight_changes = 0.0
-            for ticker in all_tickers:
-                prev_weight = prev_portfolio.loc[ticker, 'weight'] if ticker in prev_portfolio.index else 0.0
-                curr_weight = curr_portfolio.loc[ticker, 'weight'] if ticker in curr_portfolio.index else 0.0
-                weight_changes += abs(curr_weight - prev_weight)
+            # Align on Ticker and compute weight changes (missing = 0 weight)
+            weight_changes = curr_portfolio['weight'].sub(prev_portfolio['weight'], fill_value=0.0).abs().sum()
             
             # Turnover = sum of absolute weight changes / 2
             turnover = weight_changes / 2
@@ -455,28 +431,17 @@ def save_results(frequency, weighting, daily_returns, metrics, turnover):
     daily_returns.to_csv(returns_file, index=False)
     print(f"\n  Saved daily returns to: {returns_file}")
     
-    # Save summary metrics
-    summary_rows = []
-    for portfolio_type in ['long', 'short', 'long_short']:
-        m = metrics[portfolio_type]
-        summary_rows.append({
-            'portfolio': portfolio_type,
-            'frequency': frequency,
-            'weighting': weighting,
-            'total_return': m['total_return'],
-            'annualized_return': m['annualized_return'],
-            'volatility': m['volatility'],
-            'sharpe_ratio': m['sharpe_ratio'],
-            'max_drawdown': m['max_drawdown'],
-            'mean_daily_return': m['mean_daily_return'],
-            'n_days': m['n_days'],
-            'avg_turnover': turnover
-        })
-    
-    summary_df = pd.DataFrame(summary_rows)
+    # Save summary metrics (one row per portfolio, built straight from the metrics dict)
+    summary_df = pd.DataFrame.from_dict(metrics, orient='index').rename_axis('portfolio').reset_index()
+    summary_df.insert(1, 'frequency', frequency)
+    summary_df.insert(2, 'weighting', weighting)
+    summary_df['avg_turnover'] = turnover
+    
     summary_file = os.path.join(OUTPUT_DIR, f"portfolio_summary_{config_name}.csv")
     summary_df.to_csv(summary_file, index=False)
     print(f"  Saved summary metrics to: {summary_file}")
+    
+    return summary_df
 
 
 def main():
@@ -497,12 +462,13 @@ def main():
             
             try:
                 daily_returns, metrics, turnover, portfolio_df = run_backtest(freq, weight)
-                save_results(freq, weight, daily_returns, metrics, turnover)
+                summary_df = save_results(freq, weight, daily_returns, metrics, turnover)
                 
                 all_results[config_name] = {
                     'daily_returns': daily_returns,
                     'metrics': metrics,
-                    'turnover': turnover
+                    'turnover': turnover,
+                    'summary_df': summary_df
                 }
                 
             except Exception as e:
@@ -514,24 +480,16 @@ def main():
     print("CROSS-CONFIGURATION COMPARISON")
     print(f"{'='*60}")
     
-    comparison_rows = []
-    for config_name, results in all_results.items():
-        freq, weight = config_name.split('_')
-        ls_metrics = results['metrics']['long_short']
-        
-        comparison_rows.append({
-            'configuration': config_name,
-            'frequency': freq,
-            'weighting': weight,
-            'LS_total_return': ls_metrics['total_return'],
-            'LS_annualized_return': ls_metrics['annualized_return'],
-            'LS_volatility': ls_metrics['volatility'],
-            'LS_sharpe_ratio': ls_metrics['sharpe_ratio'],
-            'LS_max_drawdown': ls_metrics['max_drawdown'],
-            'avg_turnover': results['turnover']
-        })
-    
-    comparison_df = pd.DataFrame(comparison_rows)
+    # Reuse the saved per-config summaries; frequency/weighting are already columns
+    ls_metric_cols = ['total_return', 'annualized_return', 'volatility', 'sharpe_ratio', 'max_drawdown']
+    comparison_df = pd.DataFrame()
+    if all_results:
+        comparison_df = pd.concat(
+            [results['summary_df'].assign(configuration=config_name) for config_name, results in all_results.items()],
+            ignore_index=True
+        ).query("portfolio == 'long_short'")
+        comparison_df = comparison_df[['configuration', 'frequency', 'weighting'] + ls_metric_cols + ['avg_turnover']]
+        comparison_df = comparison_df.rename(columns={col: f'LS_{col}' for col in ls_metric_cols})
     comparison_file = os.path.join(OUTPUT_DIR, "portfolio_comparison_all_configs.csv")
     comparison_df.to_csv(comparison_file, index=False)
     
@@ -60,17 +60,19 @@ def load_data():
 
 def build_trading_calendar_by_ticker(returns_df):
     """
-    Build a dictionary mapping each ticker to its sorted list of trading days.
+    Build a dictionary mapping each ticker to its sorted array of trading days.
     
     Returns:
-        dict: {ticker: sorted list of trading dates}
+        dict: {ticker: sorted datetime64 array of trading dates}
     """
     print("\nBuilding per-ticker trading calendars...")
     
-    calendar = {}
-    for ticker in returns_df['TICKER'].unique():
-        ticker_dates = returns_df[returns_df['TICKER'] == ticker]['date'].sort_values().tolist()
-        calendar[ticker] = ticker_dates
+    # One sort, then split the date column at ticker boundaries (rows without a ticker have no calendar)
+    sorted_df = returns_df.dropna(subset=['TICKER']).sort_values(['TICKER', 'date'])
+    tickers_arr = sorted_df['TICKER'].to_numpy()
+    dates_arr = sorted_df['date'].to_numpy(dtype='datetime64[ns]')
+    unique_tickers, start_idx = np.unique(tickers_arr, return_index=True)
+    calendar = dict(zip(unique_tickers, np.split(dates_arr, start_idx[1:])))
     
     print(f"  Created calendars for {len(calendar)} tickers")
     
@@ -81,35 +83,26 @@ def build_trading_calendar_by_ticker(returns_df):
     return calendar
 
 
-def find_next_trading_day(signal_date, ticker, trading_calendar, max_gap_days=5):
+def find_next_trading_days(signal_dates, ticker_dates):
     """
-    Find the next available trading day for a ticker after the signal date.
+    Find the next available trading day after each signal date for one ticker.
     
     Args:
-        signal_date: datetime of sentiment signal
-        ticker: stock ticker
-        trading_calendar: dict mapping ticker to list of trading dates
-        max_gap_days: maximum allowed gap (calendar days)
+        signal_dates: datetime64 array of sentiment signal dates
+        ticker_dates: sorted datetime64 array of the ticker's trading dates
     
     Returns:
-        datetime of next trading day, or None if no match within max_gap
+        tuple: (next_dates, has_next) where next_dates holds the first trading
+        date strictly after each signal date and has_next flags rows where
+        such a date exists (next_dates is NaT elsewhere)
     """
-    if ticker not in trading_calendar:
-        return None
+    pos = np.searchsorted(ticker_dates, signal_dates, side='right')
+    has_next = pos < len(ticker_dates)
     
-    ticker_dates = trading_calendar[ticker]
+    next_dates = np.full(len(signal_dates), np.datetime64('NaT'), dtype='datetime64[ns]')
+    next_dates[has_next] = ticker_dates[pos[has_next]]
     
-    # Find first date strictly after signal_date
-    for trade_date in ticker_dates:
-        if trade_date > signal_date:
-            # Check if within max gap
-            gap = (trade_date - signal_date).days
-            if gap <= max_gap_days:
-                return trade_date
-            else:
-                return None  # Too far in the future
-    
-    return None  # No trading day found after signal_date
+    return next_dates, has_next
 
 
 def create_signal_return_panel(sentiment_df, returns_df, trading_calendar, max_gap_days=5):
@@ -118,75 +111,39 @@ def create_signal_return_panel(sentiment_df, returns_df, trading_calendar, max_g
     """
     print(f"\nMapping sentiment signals to next trading days (max gap: {max_gap_days} days)...")
     
-    # Prepare output lists
-    results = []
+    signal_dates = sentiment_df['date_day'].to_numpy(dtype='datetime64[ns]')
+    next_dates = np.full(len(sentiment_df), np.datetime64('NaT'), dtype='datetime64[ns]')
+    has_next = np.zeros(len(sentiment_df), dtype=bool)
+    
+    # One searchsorted per ticker instead of a Python scan per sentiment row
+    for ticker, row_idx in sentiment_df.groupby('Ticker', sort=False).indices.items():
+        if ticker not in trading_calendar:
+            continue  # Ticker not in returns at all
+        next_dates[row_idx], has_next[row_idx] = find_next_trading_days(signal_dates[row_idx], trading_calendar[ticker])
+    
+    days_gap = (next_dates - signal_dates).astype('timedelta64[D]').astype(np.int64)  # NaT rows masked by has_next
+    within_gap = has_next & (days_gap <= max_gap_days)
     
     # Track statistics
-    matched = 0
-    no_trading_day = 0
-    gap_too_large = 0
-    
-    # Process each sentiment observation
-    for idx, row in sentiment_df.iterrows():
-        ticker = row['Ticker']
-        signal_date = row['date_day']
-        signal_score = row['Sentiment_Score']
-        
-        # Find next trading day
-        next_trade_date = find_next_trading_day(signal_date, ticker, trading_calendar, max_gap_days)
-        
-        if next_trade_date is None:
-            # Check if ticker exists in calendar
-            if ticker in trading_calendar:
-                # Ticker exists but no match within max_gap
-                # Try without gap limit to see actual gap
-                for trade_date in trading_calendar[ticker]:
-                    if trade_date > signal_date:
-                        actual_gap = (trade_date - signal_date).days
-                        if actual_gap > max_gap_days:
-                            gap_too_large += 1
-                        break
-                else:
-                    no_trading_day += 1  # Signal after last trading day
-            else:
-                no_trading_day += 1  # Ticker not in returns at all
-            continue
-        
-        # Get the return data for this (ticker, next_trade_date)
-        return_row = returns_df[
-            (returns_df['TICKER'] == ticker) & 
-            (returns_df['date'] == next_trade_date)
-        ]
-        
-        if len(return_row) == 0:
-            # This shouldn't happen if trading_calendar is built correctly
-            no_trading_day += 1
-            continue
-        
-        return_row = return_row.iloc[0]
-        
-        # Calculate days gap
-        days_gap = (next_trade_date - signal_date).days
-        
-        # Append to results
-        results.append({
-            'Ticker': ticker,
-            'signal_date': signal_date,
-            'signal_score': signal_score,
-            'return_date': next_trade_date,
-            'RET': return_row['RET'],
-            'PRC': return_row['PRC'],
-            'MV_USD_lag': return_row['MV_USD_lag'],
-            'days_gap': days_gap
-        })
-        
-        matched += 1
-        
-        # Progress indicator
-        if (idx + 1) % 10000 == 0:
-            print(f"  Processed {idx + 1}/{len(sentiment_df)} records...")
+    matched = int(within_gap.sum())
+    gap_too_large = int((has_next & ~within_gap).sum())
+    no_trading_day = int((~has_next).sum())  # Signal after last trading day or ticker missing
+    
+    # Get the return data for each (ticker, next_trade_date)
+    return_data = (
+        returns_df[['TICKER', 'date', 'RET', 'PRC', 'MV_USD_lag']]
+        .drop_duplicates(['TICKER', 'date'])
+        .rename(columns={'TICKER': 'Ticker', 'date': 'return_date'})
+    )
     
-    panel_df = pd.DataFrame(results)
+    panel_df = pd.DataFrame({
+        'Ticker': sentiment_df['Ticker'].to_numpy()[within_gap],
+        'signal_date': signal_dates[within_gap],
+        'signal_score': sentiment_df['Sentiment_Score'].to_numpy()[within_gap],
+        'return_date': next_dates[within_gap],
+    })
+    panel_df = panel_df.merge(return_data, on=['Ticker', 'return_date'], how='left')
+    panel_df['days_gap'] = days_gap[within_gap]
     
     # Statistics
     print(f"\n{'='*60}")
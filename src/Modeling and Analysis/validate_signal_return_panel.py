@@ -72,6 +72,8 @@ def analyze_coverage(df):
     if len(low_obs_tickers) > 0:
         print(f"\n⚠️  Warning: {len(low_obs_tickers)} tickers have < 5 observations")
         print(f"     Sample: {low_obs_tickers.head(5).to_dict()}")
+    
+    return obs_per_ticker
 
 
 def analyze_daily_ticker_counts(df):
@@ -80,8 +82,9 @@ def analyze_daily_ticker_counts(df):
     print("DAILY TICKER COUNT ANALYSIS")
     print(f"{'='*60}")
     
-    # Count tickers per signal date
-    daily_counts = df.groupby('signal_date')['Ticker'].nunique()
+    # Count tickers per signal date (dedupe first so the count is a plain
+    # group size instead of the slow object-dtype nunique path)
+    daily_counts = df.drop_duplicates(['signal_date', 'Ticker']).groupby('signal_date').size()
     
     print(f"Trading days with signals: {len(daily_counts)}")
     print(f"\nTickers available per day:")
@@ -110,20 +113,25 @@ def analyze_gap_distribution(df):
     print("GAP DISTRIBUTION (Signal → Return)")
     print(f"{'='*60}")
     
-    gap_counts = df['days_gap'].value_counts().sort_index()
+    # days_gap is a small non-negative integer, so count with bincount instead of hashing
+    gap_bins = np.bincount(df['days_gap'].to_numpy())
+    observed_gaps = np.flatnonzero(gap_bins)
+    gap_counts = pd.Series(gap_bins[observed_gaps], index=pd.Index(observed_gaps, name='days_gap'), name='count')
     print("\nGap frequency:")
     print(gap_counts)
     
+    # Mode and max come straight from the bin counts; the median is reused below
+    gap_median = df['days_gap'].median()
     print(f"\nGap statistics:")
     print(f"  Mean: {df['days_gap'].mean():.2f} days")
-    print(f"  Median: {df['days_gap'].median():.0f} days")
-    print(f"  Mode: {df['days_gap'].mode()[0]} days")
-    print(f"  Max: {df['days_gap'].max()} days")
+    print(f"  Median: {gap_median:.0f} days")
+    print(f"  Mode: {gap_bins.argmax()} days")
+    print(f"  Max: {observed_gaps[-1]} days")
     
     # Interpretation
-    if df['days_gap'].median() == 1:
+    if gap_median == 1:
         print("\n✅ Most signals match to next-day returns (expected for weekdays)")
-    elif df['days_gap'].median() <= 3:
+    elif gap_median <= 3:
         print("\n✅ Most signals match within 3 days (includes weekends)")
     else:
         print("\n⚠️  Warning: Median gap is high; check for data issues")
@@ -137,23 +145,31 @@ def analyze_signal_distribution(df):
     print("SIGNAL DISTRIBUTION")
     print(f"{'='*60}")
     
+    # Compute each summary statistic once
+    signal = df['signal_score']
+    signal_mean, signal_std = signal.mean(), signal.std()
+    signal_min, signal_max = signal.min(), signal.max()
+    # Median and concentration quantiles from one numpy quantile pass (NaNs skipped, as in pandas)
+    quantile_levels = [0.05, 0.25, 0.5, 0.75, 0.95]
+    signal_quantiles = np.nanquantile(signal.to_numpy(dtype=float), quantile_levels)
+    signal_median = signal_quantiles[quantile_levels.index(0.5)]
+    
     print(f"\nSignal statistics:")
-    print(f"  Mean: {df['signal_score'].mean():.4f}")
-    print(f"  Median: {df['signal_score'].median():.4f}")
-    print(f"  Std: {df['signal_score'].std():.4f}")
-    print(f"  Min: {df['signal_score'].min():.4f}")
-    print(f"  Max: {df['signal_score'].max():.4f}")
-    
-    # Check for extreme signals
-    extreme_signals = df[df['signal_score'].abs() > EXTREME_SIGNAL_THRESHOLD]
-    if len(extreme_signals) > 0:
-        print(f"\n⚠️  Warning: {len(extreme_signals)} signals have |score| > {EXTREME_SIGNAL_THRESHOLD}")
+    print(f"  Mean: {signal_mean:.4f}")
+    print(f"  Median: {signal_median:.4f}")
+    print(f"  Std: {signal_std:.4f}")
+    print(f"  Min: {signal_min:.4f}")
+    print(f"  Max: {signal_max:.4f}")
+    
+    # Check for extreme signals (only a count is needed)
+    n_extreme_signals = int((np.abs(signal.to_numpy()) > EXTREME_SIGNAL_THRESHOLD).sum())
+    if n_extreme_signals > 0:
+        print(f"\n⚠️  Warning: {n_extreme_signals} signals have |score| > {EXTREME_SIGNAL_THRESHOLD}")
         print(f"     (Sentiment scores should typically be in [-1, 1])")
     
     # Check for concentration
-    quantiles = df['signal_score'].quantile([0.05, 0.25, 0.5, 0.75, 0.95])
     print(f"\nSignal quantiles:")
-    for q, val in quantiles.items():
+    for q, val in zip(quantile_levels, signal_quantiles):
         print(f"  {q*100:.0f}%: {val:.4f}")
 
 
@@ -163,31 +179,42 @@ def analyze_return_distribution(df):
     print("RETURN DISTRIBUTION")
     print(f"{'='*60}")
     
+    # Compute each summary statistic once
+    ret = df['RET']
+    ret_mean, ret_std = ret.mean(), ret.std()
+    ret_min, ret_max = ret.min(), ret.max()
+    # Median and tail quantiles from one numpy quantile pass (NaNs skipped, as in pandas)
+    quantile_levels = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+    ret_quantiles = np.nanquantile(ret.to_numpy(dtype=float), quantile_levels)
+    ret_median = ret_quantiles[quantile_levels.index(0.5)]
+    
     print(f"\nReturn statistics:")
-    print(f"  Mean: {df['RET'].mean():.6f} ({df['RET'].mean()*100:.4f}%)")
-    print(f"  Median: {df['RET'].median():.6f} ({df['RET'].median()*100:.4f}%)")
-    print(f"  Std: {df['RET'].std():.6f} ({df['RET'].std()*100:.4f}%)")
-    print(f"  Min: {df['RET'].min():.6f} ({df['RET'].min()*100:.2f}%)")
-    print(f"  Max: {df['RET'].max():.6f} ({df['RET'].max()*100:.2f}%)")
-    
-    # Check for extreme returns
-    extreme_pos = df[df['RET'] > EXTREME_RETURN_THRESHOLD]
-    extreme_neg = df[df['RET'] < -EXTREME_RETURN_THRESHOLD]
-    
-    if len(extreme_pos) > 0:
-        print(f"\n⚠️  {len(extreme_pos)} observations with returns > {EXTREME_RETURN_THRESHOLD*100:.0f}%")
+    print(f"  Mean: {ret_mean:.6f} ({ret_mean*100:.4f}%)")
+    print(f"  Median: {ret_median:.6f} ({ret_median*100:.4f}%)")
+    print(f"  Std: {ret_std:.6f} ({ret_std*100:.4f}%)")
+    print(f"  Min: {ret_min:.6f} ({ret_min*100:.2f}%)")
+    print(f"  Max: {ret_max:.6f} ({ret_max*100:.2f}%)")
+    
+    # Check for extreme returns; subsets are only built when there is something to show
+    ret_values = ret.to_numpy()
+    extreme_pos = ret_values > EXTREME_RETURN_THRESHOLD
+    extreme_neg = ret_values < -EXTREME_RETURN_THRESHOLD
+    n_extreme_pos = int(extreme_pos.sum())
+    n_extreme_neg = int(extreme_neg.sum())
+    
+    if n_extreme_pos > 0:
+        print(f"\n⚠️  {n_extreme_pos} observations with returns > {EXTREME_RETURN_THRESHOLD*100:.0f}%")
         print(f"     Sample (top 5):")
-        print(extreme_pos.nlargest(5, 'RET')[['Ticker', 'return_date', 'RET', 'signal_score']])
+        print(df.loc[extreme_pos].nlargest(5, 'RET')[['Ticker', 'return_date', 'RET', 'signal_score']])
     
-    if len(extreme_neg) > 0:
-        print(f"\n⚠️  {len(extreme_neg)} observations with returns < -{EXTREME_RETURN_THRESHOLD*100:.0f}%")
+    if n_extreme_neg > 0:
+        print(f"\n⚠️  {n_extreme_neg} observations with returns < -{EXTREME_RETURN_THRESHOLD*100:.0f}%")
         print(f"     Sample (bottom 5):")
-        print(extreme_neg.nsmallest(5, 'RET')[['Ticker', 'return_date', 'RET', 'signal_score']])
+        print(df.loc[extreme_neg].nsmallest(5, 'RET')[['Ticker', 'return_date', 'RET', 'signal_score']])
     
     # Quantiles
-    quantiles = df['RET'].quantile([0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99])
     print(f"\nReturn quantiles:")
-    for q, val in quantiles.items():
+    for q, val in zip(quantile_levels, ret_quantiles):
         print(f"  {q*100:.0f}%: {val:.6f} ({val*100:.4f}%)")
 
 
@@ -205,16 +232,20 @@ def check_missing_data(df):
         print(missing[missing > 0])
 
 
-def create_validation_plots(df, daily_counts, gap_counts, output_dir):
-    """Generate validation plots"""
+def create_validation_plots(df, daily_counts, gap_counts, obs_per_ticker, output_dir):
+    """Generate validation plots; returns the signal/return summary stats and correlation"""
     print(f"\n{'='*60}")
     print("GENERATING VALIDATION PLOTS")
     print(f"{'='*60}")
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # Create a figure with 6 subplots
-    fig, axes = plt.subplots(2, 3, figsize=(18, 10))
+    # Scalar reductions over the two value columns, computed in one pass and reused below and in main()
+    panel_stats = df[['signal_score', 'RET']].agg(['mean', 'min', 'max'])
+    corr = df['signal_score'].corr(df['RET'])
+    
+    # Create a figure with 6 subplots (constrained layout is resolved once, at draw time)
+    fig, axes = plt.subplots(2, 3, figsize=(18, 10), constrained_layout=True)
     fig.suptitle('Signal-Return Panel Validation', fontsize=16, fontweight='bold')
     
     # 1. Daily ticker count over time
@@ -231,8 +262,9 @@ def create_validation_plots(df, daily_counts, gap_counts, output_dir):
     # 2. Signal score distribution (histogram)
     ax = axes[0, 1]
     ax.hist(df['signal_score'], bins=50, color='green', alpha=0.7, edgecolor='black')
-    ax.axvline(x=df['signal_score'].mean(), color='red', linestyle='--', 
-               linewidth=2, label=f'Mean: {df["signal_score"].mean():.3f}')
+    signal_mean = panel_stats.loc['mean', 'signal_score']
+    ax.axvline(x=signal_mean, color='red', linestyle='--', 
+               linewidth=2, label=f'Mean: {signal_mean:.3f}')
     ax.set_title('Signal Score Distribution')
     ax.set_xlabel('Sentiment Score')
     ax.set_ylabel('Frequency')
@@ -244,8 +276,9 @@ def create_validation_plots(df, daily_counts, gap_counts, output_dir):
     # Clip extreme values for better visualization
     returns_clipped = df['RET'].clip(-0.20, 0.20)
     ax.hist(returns_clipped, bins=50, color='orange', alpha=0.7, edgecolor='black')
-    ax.axvline(x=df['RET'].mean(), color='red', linestyle='--', 
-               linewidth=2, label=f'Mean: {df["RET"].mean():.4f}')
+    ret_mean = panel_stats.loc['mean', 'RET']
+    ax.axvline(x=ret_mean, color='red', linestyle='--', 
+               linewidth=2, label=f'Mean: {ret_mean:.4f}')
     ax.set_title('Return Distribution (clipped at ±20%)')
     ax.set_xlabel('Daily Return')
     ax.set_ylabel('Frequency')
@@ -267,7 +300,9 @@ def create_validation_plots(df, daily_counts, gap_counts, output_dir):
         plot_df = df.sample(10000, random_state=42)
     else:
         plot_df = df
-    ax.scatter(plot_df['signal_score'], plot_df['RET'], alpha=0.3, s=10, color='steelblue')
+    # Single-style markers: one Line2D is much cheaper to draw than a per-point PathCollection
+    ax.plot(plot_df['signal_score'].to_numpy(), plot_df['RET'].to_numpy(), 'o', linestyle='none',
+            markersize=3, alpha=0.3, color='steelblue', rasterized=True)
     ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
     ax.axvline(x=0, color='black', linestyle='-', linewidth=0.5)
     ax.set_title('Signal vs Next-Day Return')
@@ -275,30 +310,28 @@ def create_validation_plots(df, daily_counts, gap_counts, output_dir):
     ax.set_ylabel('Next-Day Return')
     ax.grid(True, alpha=0.3)
     
-    # Compute correlation
-    corr = df['signal_score'].corr(df['RET'])
     ax.text(0.05, 0.95, f'Correlation: {corr:.4f}', 
             transform=ax.transAxes, verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
     # 6. Observations per ticker (histogram)
     ax = axes[1, 2]
-    obs_per_ticker = df.groupby('Ticker').size()
     ax.hist(obs_per_ticker, bins=30, color='teal', alpha=0.7, edgecolor='black')
-    ax.axvline(x=obs_per_ticker.mean(), color='red', linestyle='--', 
-               linewidth=2, label=f'Mean: {obs_per_ticker.mean():.1f}')
+    obs_mean = obs_per_ticker.mean()
+    ax.axvline(x=obs_mean, color='red', linestyle='--', 
+               linewidth=2, label=f'Mean: {obs_mean:.1f}')
     ax.set_title('Observations per Ticker')
     ax.set_xlabel('Number of Observations')
     ax.set_ylabel('Number of Tickers')
     ax.legend()
     ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    
     output_path = os.path.join(output_dir, 'panel_validation(3).png')
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.savefig(output_path, dpi=150)
     print(f"  Saved validation plots to: {output_path}")
     plt.close()
+    
+    return panel_stats, corr
 
 
 def main():
@@ -310,7 +343,7 @@ def main():
     df = load_panel()
     
     # Run validation checks
-    analyze_coverage(df)
+    obs_per_ticker = analyze_coverage(df)
     daily_counts = analyze_daily_ticker_counts(df)
     gap_counts = analyze_gap_distribution(df)
     analyze_signal_distribution(df)
@@ -318,7 +351,7 @@ def main():
     check_missing_data(df)
     
     # Generate plots
-    create_validation_plots(df, daily_counts, gap_counts, OUTPUT_DIR)
+    panel_stats, corr = create_validation_plots(df, daily_counts, gap_counts, obs_per_ticker, OUTPUT_DIR)
     
     # Final summary
     print(f"\n{'='*60}")
@@ -328,15 +361,17 @@ def main():
     print(f"Unique tickers: {df['Ticker'].nunique()}")
     print(f"Date range: {df['signal_date'].min()} to {df['signal_date'].max()}")
     print(f"Mean tickers per day: {daily_counts.mean():.1f}")
-    print(f"Signal-Return correlation: {df['signal_score'].corr(df['RET']):.4f}")
+    print(f"Signal-Return correlation: {corr:.4f}")
     
     # Overall health check
     issues = []
     if daily_counts.min() < MIN_TICKERS_PER_DAY:
         issues.append(f"Some days have < {MIN_TICKERS_PER_DAY} tickers")
-    if df['signal_score'].abs().max() > EXTREME_SIGNAL_THRESHOLD:
+    # Largest absolute value is the larger of |min| and |max|
+    abs_max = panel_stats.loc[['min', 'max']].abs().max()
+    if abs_max['signal_score'] > EXTREME_SIGNAL_THRESHOLD:
         issues.append("Extreme signal values detected")
-    if df['RET'].abs().max() > EXTREME_RETURN_THRESHOLD:
+    if abs_max['RET'] > EXTREME_RETURN_THRESHOLD:
         issues.append("Extreme return values detected")
     
     if len(issues) == 0:
@@ -1,9 +1,15 @@
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; figures are only saved to disk
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy import stats
+from scipy.ndimage import uniform_filter1d
 import seaborn as sns
 import os
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 
 # Get project root (go up two levels from src/Prompt Comparison/)
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,77 +20,151 @@ MERGED_DATA_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing Phas
 OUTPUT_DIR = os.path.join(project_root, 'Figures and Tables', 'Plots Used For Prompt Evaluation', 'Aggregate Analysis')
 STATS_OUTPUT_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing Phase', 'Score Statistics Used For Prompt Evaluation', 'Aggregate_Statistics.csv')
 
-def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
+# Columns read from the merged data (Ticker is optional)
+ANALYSIS_COLUMNS = {'Ticker', 'RET', 'Score'}
+
+# Raw-point scatters draw at most this many (uniformly sampled) points;
+# histograms, trend lines and moving averages still use every row
+MAX_SCATTER_POINTS = 50000
+
+def _uniform_bin_index(values, lo, hi, n):
+    """Bin index of each value for n equal-width bins on [lo, hi] (same edges as np.linspace)."""
+    if hi <= lo:
+        return np.zeros(len(values), dtype=np.intp)
+    idx = ((values - lo) * (n / (hi - lo))).astype(np.intp)
+    # The right edge is inclusive, so values equal to hi belong to the last bin
+    np.minimum(idx, n - 1, out=idx)
+    
+    # Floating-point rounding can put a value sitting on an edge one bin off; fix it against the real edges
+    edges = np.linspace(lo, hi, n + 1)
+    idx -= values < edges[idx]
+    idx += (values >= edges[idx + 1]) & (idx != n - 1)
+    return idx
+
+
+def uniform_histogram2d(x, y, x_range, y_range, bins):
     """
-    Create aggregate visualizations showing how Score moves with RET across all tickers.
+    2D histogram for equal-width bins, matching np.histogram2d with linspace edges.
+    
+    Bin indices are computed directly as (value - lo) * scale instead of a per-point
+    binary search over the edge arrays, and counted with a single np.bincount.
     
     Args:
-        merged_file: Path to the merged data CSV file
-        output_dir: Directory to save the plot images
-        stats_output_file: Path to save the statistics CSV file
+        x, y: 1D NumPy arrays of equal length
+        x_range, y_range: (lo, hi) tuples; values outside are dropped, hi falls in the last bin
+        bins: (nx, ny) number of bins along each axis
+    
+    Returns:
+        Array of shape (nx, ny) with the counts (float, like np.histogram2d)
     """
-    import os
+    nx, ny = bins
+    (x_lo, x_hi), (y_lo, y_hi) = x_range, y_range
+    in_range = (x >= x_lo) & (x <= x_hi) & (y >= y_lo) & (y <= y_hi)
+    x, y = x[in_range], y[in_range]
     
-    # Read the merged data
-    print(f"Reading {merged_file}...")
-    df = pd.read_csv(merged_file)
+    x_idx = _uniform_bin_index(x, x_lo, x_hi, nx)
+    y_idx = _uniform_bin_index(y, y_lo, y_hi, ny)
     
-    print(f"Total data points: {len(df)}")
-    print(f"Columns: {df.columns.tolist()}")
+    counts = np.bincount(x_idx * ny + y_idx, minlength=nx * ny)
+    return counts.reshape(nx, ny).astype(float)
+
+
+def describe_array(values):
+    """
+    Mean, median, sample std (ddof=1), min and max of a 1D NumPy array, as a dict.
     
-    # Clean data: remove NaN and infinite values
-    print(f"\nCleaning data...")
-    original_len = len(df)
-    df = df.dropna(subset=['Score', 'RET'])
-    df = df[np.isfinite(df['Score']) & np.isfinite(df['RET'])]
-    print(f"Removed {original_len - len(df)} rows with NaN/infinite values")
-    print(f"Remaining data points: {len(df)}")
+    The mean is computed once and reused for the std deviations, and a single
+    np.partition call places the min, the median element(s) and the max.
+    """
+    n = len(values)
+    mean = values.mean()
+    deviations = values - mean
+    std = np.sqrt((deviations * deviations).sum() / (n - 1)) if n > 1 else np.nan
+    
+    mid = n // 2
+    kth = [0, mid - 1, mid, n - 1] if n % 2 == 0 else [0, mid, n - 1]
+    ordered = np.partition(values, kth)
+    median = ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    return {
+        'mean': mean,
+        'median': median,
+        'std': std,
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+
+
+def sign_shares(values):
+    """Percentage of negative, zero and positive entries of a 1D NumPy array, as [neg, neu, pos]."""
+    # One sign pass (int8 keeps the temporary small) and one bincount instead of three comparisons
+    counts = np.bincount(np.sign(values).astype(np.int8) + 1, minlength=3)
+    return counts / len(values) * 100
+
+
+def linear_fit(x, y):
+    """
+    Least-squares line y = slope*x + intercept, same fit as np.polyfit(x, y, 1).
     
-    if len(df) == 0:
-        print("ERROR: No valid data remaining after cleaning!")
-        return
+    Uses the centered sums of squares and cross-products (two dot products) instead of
+    polyfit's Vandermonde matrix and SVD. Centering avoids the cancellation of the raw
+    n*sum_xy - sum_x*sum_y form. Constant x gives a flat line through the mean of y.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    sxx = np.dot(dx, dx)
+    slope = np.dot(dx, y - y_mean) / sxx if sxx > 0 else 0.0
+    return slope, y_mean - slope * x_mean
+
+
+def centered_moving_average(values, window):
+    """
+    Centered moving average, equivalent to Series.rolling(window, center=True).mean().
     
-    # Convert RET to percentage for display
-    df['RET_pct'] = df['RET'] * 100
+    uniform_filter1d computes every window in one running-sum pass; positions whose
+    window would run past either end are set to NaN, as pandas does.
+    """
+    averaged = uniform_filter1d(values, size=window, mode='nearest')
+    half = window // 2
+    averaged[:half] = np.nan
+    averaged[max(len(values) - (window - 1 - half), half):] = np.nan
+    return averaged
+
+
+def grouped_score_stats(group_idx, score, ngroups):
+    """
+    Per-group count, mean and sample std (ddof=1) of score via np.bincount.
     
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    Args:
+        group_idx: Integer group index (0..ngroups-1) for every row
+        score: Values to summarize, aligned with group_idx
+        ngroups: Number of groups
     
-    # Calculate overall statistics
-    overall_corr = df['Score'].corr(df['RET'])
-    print(f"\nOverall Pearson Correlation: {overall_corr:.4f}")
-    print(f"Mean Score: {df['Score'].mean():.4f}")
-    print(f"Mean RET: {df['RET_pct'].mean():.4f}%")
-    print(f"Std Score: {df['Score'].std():.4f}")
-    print(f"Std RET: {df['RET_pct'].std():.4f}%")
+    Returns:
+        (count, mean, std) arrays of length ngroups; mean/std are NaN for empty groups
+    """
+    count = np.bincount(group_idx, minlength=ngroups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(group_idx, weights=score, minlength=ngroups) / count
+        # Second pass over deviations keeps the variance numerically stable
+        deviation = score - mean[group_idx]
+        std = np.sqrt(np.bincount(group_idx, weights=deviation * deviation, minlength=ngroups) / (count - 1))
+    std[count < 2] = np.nan
+    return count, mean, std
+
+
+def plot_binned_analysis(bin_stats, output_dir):
+    """
+    Figure 1: average score per 2.5% return bin (with trend line) above the bin counts.
     
-    # ===== VISUALIZATION 1: Binned Scatter Plot =====
-    # Group returns into bins and show average score for each bin
-    print("\n" + "="*60)
+    Args:
+        bin_stats: Per-bin DataFrame with RET_mean_pct, Score_mean, Score_sem and Count
+        output_dir: Directory to save the plot image
+    """
     print("Creating Figure 1: Binned Analysis...")
     
-    # Create return bins (every 2.5% or 0.025 in decimal)
-    bin_size = 0.025
-    min_ret = df['RET'].min()
-    max_ret = df['RET'].max()
-    bins = np.arange(np.floor(min_ret/bin_size)*bin_size, 
-                     np.ceil(max_ret/bin_size)*bin_size + bin_size, 
-                     bin_size)
-    
-    df['RET_bin'] = pd.cut(df['RET'], bins=bins)
-    
-    # Calculate statistics for each bin
-    bin_stats = df.groupby('RET_bin', observed=True).agg({
-        'Score': ['mean', 'std', 'count'],
-        'RET': 'mean'
-    }).reset_index()
-    bin_stats.columns = ['RET_bin', 'Score_mean', 'Score_std', 'Count', 'RET_mean']
-    bin_stats['Score_sem'] = bin_stats['Score_std'] / np.sqrt(bin_stats['Count'])  # Standard error
-    bin_stats['RET_mean_pct'] = bin_stats['RET_mean'] * 100
-    
-    # Remove bins with too few observations
-    bin_stats = bin_stats[bin_stats['Count'] >= 5]
-    
     fig1, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
     
     # Top panel: Binned scatter with error bars
@@ -95,12 +175,11 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
                  label='Avg Score ± SE')
     
     # Add trend line
-    z = np.polyfit(bin_stats['RET_mean_pct'], bin_stats['Score_mean'], 1)
-    p = np.poly1d(z)
+    slope, intercept = linear_fit(bin_stats['RET_mean_pct'], bin_stats['Score_mean'])
     x_trend = np.linspace(bin_stats['RET_mean_pct'].min(), 
                           bin_stats['RET_mean_pct'].max(), 100)
-    ax1.plot(x_trend, p(x_trend), 'r--', linewidth=2, alpha=0.8,
-            label=f'Trend: Score = {z[0]:.4f}×RET + {z[1]:.4f}')
+    ax1.plot(x_trend, slope * x_trend + intercept, 'r--', linewidth=2, alpha=0.8,
+            label=f'Trend: Score = {slope:.4f}×RET + {intercept:.4f}')
     
     ax1.axhline(y=0, color='gray', linestyle='--', linewidth=1, alpha=0.5)
     ax1.axvline(x=0, color='gray', linestyle='--', linewidth=1, alpha=0.5)
@@ -121,35 +200,38 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     
     plt.tight_layout()
     output_path1 = os.path.join(output_dir, 'aggregate_binned_analysis.png')
-    plt.savefig(output_path1, dpi=150, bbox_inches='tight')
+    plt.savefig(output_path1, dpi=150)
     print(f"✅ Saved: {output_path1}")
     plt.close()
+
+
+def plot_density_heatmap(h, ret_lo, ret_hi, overall_corr, output_dir):
+    """
+    Figure 2: 2D density of return vs score.
     
-    # ===== VISUALIZATION 2: 2D Density Heatmap =====
-    print("\nCreating Figure 2: Density Heatmap...")
+    Args:
+        h: 2D histogram counts, shape (return bins, score bins)
+        ret_lo, ret_hi: Return range (%) spanned by the histogram
+        overall_corr: Pearson correlation shown in the title
+        output_dir: Directory to save the plot image
+    """
+    print("Creating Figure 2: Density Heatmap...")
     
     fig2, ax = plt.subplots(figsize=(12, 10))
     
-    # Create 2D histogram (heatmap)
-    ret_bins = np.linspace(df['RET_pct'].min(), df['RET_pct'].max(), 40)
-    score_bins = np.linspace(-1, 1, 40)
-    
-    h, xedges, yedges = np.histogram2d(df['RET_pct'], df['Score'], 
-                                        bins=[ret_bins, score_bins])
-    
     # Plot heatmap
     im = ax.imshow(h.T, origin='lower', aspect='auto', cmap='YlOrRd',
-                   extent=[ret_bins.min(), ret_bins.max(), -1, 1],
+                   extent=[ret_lo, ret_hi, -1, 1],
                    interpolation='nearest')
     
     plt.colorbar(im, ax=ax, label='Frequency (Number of Observations)')
     
     # Add diagonal reference line (perfect correlation)
     # Normalize returns to -1 to 1 range for comparison
-    ret_range = df['RET_pct'].max() - df['RET_pct'].min()
+    ret_range = ret_hi - ret_lo
     if ret_range > 0:
-        x_diag = np.array([df['RET_pct'].min(), df['RET_pct'].max()])
-        y_diag = 2 * (x_diag - df['RET_pct'].min()) / ret_range - 1
+        x_diag = np.array([ret_lo, ret_hi])
+        y_diag = 2 * (x_diag - ret_lo) / ret_range - 1
         ax.plot(x_diag, y_diag, 'b--', linewidth=2, alpha=0.5, 
                 label='Perfect Correlation Reference')
     
@@ -162,33 +244,39 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     ax.legend(fontsize=10, loc='upper left')
     ax.grid(True, alpha=0.3, color='white', linewidth=0.5)
     
+    plt.tight_layout()
     output_path2 = os.path.join(output_dir, 'aggregate_density_heatmap.png')
-    plt.savefig(output_path2, dpi=150, bbox_inches='tight')
+    plt.savefig(output_path2, dpi=150)
     print(f"✅ Saved: {output_path2}")
     plt.close()
+
+
+def plot_sorted_movement(sample_pos, ret_pct_sample, score_sample, ret_pct_ma, score_ma, window, output_dir):
+    """
+    Figure 3: returns and scores sorted by return, with their moving averages.
     
-    # ===== VISUALIZATION 3: Sorted Line Plot =====
-    print("\nCreating Figure 3: Sorted Relationship...")
-    
-    # Sort by return and apply moving average to see trend
-    df_sorted = df.sort_values('RET').reset_index(drop=True)
-    window = max(50, len(df) // 100)  # Adaptive window size
-    
-    df_sorted['Score_MA'] = df_sorted['Score'].rolling(window=window, center=True).mean()
-    df_sorted['RET_pct_MA'] = df_sorted['RET_pct'].rolling(window=window, center=True).mean()
+    Args:
+        sample_pos: Sorted positions (in return order) of the sampled raw points
+        ret_pct_sample, score_sample: Return (%) and score at those positions
+        ret_pct_ma, score_ma: Centered moving averages over all return-sorted rows
+        window: Moving-average window (points)
+        output_dir: Directory to save the plot image
+    """
+    print("Creating Figure 3: Sorted Relationship...")
     
     fig3, ax = plt.subplots(figsize=(14, 8))
     
-    # Plot raw data as scatter (semi-transparent)
-    ax.scatter(range(len(df_sorted)), df_sorted['RET_pct'], 
+    # Plot raw data as scatter (semi-transparent); the sample positions keep the x-axis
+    # spanning every observation
+    ax.scatter(sample_pos, ret_pct_sample, 
               alpha=0.1, s=10, color='blue', label='Raw Returns')
-    ax.scatter(range(len(df_sorted)), df_sorted['Score'] * 10,  # Scale score for visibility
+    ax.scatter(sample_pos, score_sample * 10,  # Scale score for visibility
               alpha=0.1, s=10, color='red', label='Raw Score (×10)')
     
     # Plot moving averages
-    ax.plot(df_sorted['RET_pct_MA'], linewidth=2.5, color='darkblue', 
+    ax.plot(ret_pct_ma, linewidth=2.5, color='darkblue', 
            label=f'Return MA ({window}-point)', alpha=0.9)
-    ax.plot(df_sorted['Score_MA'] * 10, linewidth=2.5, color='darkred',
+    ax.plot(score_ma * 10, linewidth=2.5, color='darkred',
            label=f'Score MA (×10, {window}-point)', alpha=0.9)
     
     ax.axhline(y=0, color='gray', linestyle='--', linewidth=1, alpha=0.5)
@@ -199,13 +287,25 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     ax.legend(fontsize=10)
     ax.grid(True, alpha=0.3)
     
+    plt.tight_layout()
     output_path3 = os.path.join(output_dir, 'aggregate_sorted_movement.png')
-    plt.savefig(output_path3, dpi=150, bbox_inches='tight')
+    plt.savefig(output_path3, dpi=150)
     print(f"✅ Saved: {output_path3}")
     plt.close()
+
+
+def plot_joint_distribution(ret_pct_arr, score_arr, scatter_sample, ret_stats, overall_corr, output_dir):
+    """
+    Figure 4: return vs score scatter with marginal histograms.
     
-    # ===== VISUALIZATION 4: Joint Distribution with Marginals =====
-    print("\nCreating Figure 4: Joint Distribution...")
+    Args:
+        ret_pct_arr, score_arr: Cleaned return (%) and score arrays (all rows)
+        scatter_sample: Row positions drawn in the scatter
+        ret_stats: describe_array() result for ret_pct_arr
+        overall_corr: Pearson correlation shown in the legend
+        output_dir: Directory to save the plot image
+    """
+    print("Creating Figure 4: Joint Distribution...")
     
     fig4 = plt.figure(figsize=(12, 10))
     gs = fig4.add_gridspec(3, 3, hspace=0.05, wspace=0.05,
@@ -213,22 +313,23 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     
     # Main scatter plot
     ax_main = fig4.add_subplot(gs[1, 1])
-    scatter = ax_main.scatter(df['RET_pct'], df['Score'], 
-                             alpha=0.3, s=20, c=df['RET_pct'], 
+    # Scatter a uniform sample; the colour scale is pinned to the full return range
+    sample_ret_pct = ret_pct_arr[scatter_sample]
+    scatter = ax_main.scatter(sample_ret_pct, score_arr[scatter_sample], 
+                             alpha=0.3, s=20, c=sample_ret_pct, 
+                             vmin=ret_stats['min'], vmax=ret_stats['max'],
                              cmap='coolwarm', edgecolors='none')
     
     # Add trend line (with error handling)
     try:
-        # Remove any remaining NaN values for polyfit
-        valid_mask = np.isfinite(df['RET_pct']) & np.isfinite(df['Score'])
-        ret_valid = df.loc[valid_mask, 'RET_pct'].values
-        score_valid = df.loc[valid_mask, 'Score'].values
+        # NaN/inf rows were already removed during cleaning
+        ret_valid = ret_pct_arr
+        score_valid = score_arr
         
         if len(ret_valid) > 2 and np.std(ret_valid) > 0 and np.std(score_valid) > 0:
-            z = np.polyfit(ret_valid, score_valid, 1)
-            p = np.poly1d(z)
+            slope, intercept = linear_fit(ret_valid, score_valid)
             x_trend = np.linspace(ret_valid.min(), ret_valid.max(), 100)
-            ax_main.plot(x_trend, p(x_trend), 'r--', linewidth=2, alpha=0.8,
+            ax_main.plot(x_trend, slope * x_trend + intercept, 'r--', linewidth=2, alpha=0.8,
                         label=f'ρ={overall_corr:.3f}')
         else:
             ax_main.text(0.5, 0.5, f'ρ={overall_corr:.3f}\n(Insufficient variance for trend line)',
@@ -249,7 +350,7 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     
     # Top histogram (Return distribution)
     ax_top = fig4.add_subplot(gs[0, 1], sharex=ax_main)
-    ax_top.hist(df['RET_pct'], bins=50, color='steelblue', alpha=0.7, edgecolor='black')
+    ax_top.hist(ret_pct_arr, bins=50, color='steelblue', alpha=0.7, edgecolor='black')
     ax_top.set_ylabel('Frequency', fontsize=10)
     ax_top.set_title('Joint Distribution: Return vs Score with Marginals', 
                      fontsize=13, fontweight='bold', pad=10)
@@ -258,7 +359,7 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     
     # Right histogram (Score distribution)
     ax_right = fig4.add_subplot(gs[1, 2], sharey=ax_main)
-    ax_right.hist(df['Score'], bins=50, orientation='horizontal', 
+    ax_right.hist(score_arr, bins=50, orientation='horizontal', 
                  color='coral', alpha=0.7, edgecolor='black')
     ax_right.set_xlabel('Frequency', fontsize=10)
     ax_right.tick_params(labelleft=False)
@@ -269,24 +370,22 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     plt.colorbar(scatter, cax=ax_cbar, orientation='horizontal', 
                 label='Return (%) - Color Coding')
     
+    # The marginal/colorbar grid spec is not supported by tight_layout, so this figure keeps the tight bbox
     output_path4 = os.path.join(output_dir, 'aggregate_joint_distribution.png')
     plt.savefig(output_path4, dpi=150, bbox_inches='tight')
     print(f"✅ Saved: {output_path4}")
     plt.close()
+
+
+def plot_quantile_analysis(quintile_stats, output_dir):
+    """
+    Figure 5: average score per return decile.
     
-    # ===== VISUALIZATION 5: Quantile Analysis =====
-    print("\nCreating Figure 5: Quantile Analysis...")
-    
-    # Divide returns into quantiles and compare scores
-    df['RET_quintile'] = pd.qcut(df['RET'], q=10, labels=False, duplicates='drop')
-    quintile_stats = df.groupby('RET_quintile').agg({
-        'RET': ['mean', 'min', 'max'],
-        'Score': ['mean', 'std', 'count']
-    }).reset_index()
-    quintile_stats.columns = ['Quintile', 'RET_mean', 'RET_min', 'RET_max', 
-                              'Score_mean', 'Score_std', 'Count']
-    quintile_stats['RET_mean_pct'] = quintile_stats['RET_mean'] * 100
-    quintile_stats['Score_sem'] = quintile_stats['Score_std'] / np.sqrt(quintile_stats['Count'])
+    Args:
+        quintile_stats: Per-decile DataFrame with Quintile, RET_mean_pct, Score_mean and Score_sem
+        output_dir: Directory to save the plot image
+    """
+    print("Creating Figure 5: Quantile Analysis...")
     
     fig5, ax = plt.subplots(figsize=(14, 8))
     
@@ -319,10 +418,197 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
                                           quintile_stats['RET_mean_pct'])):
         ax.text(i, score + 0.05, f'{score:.3f}', ha='center', fontsize=9, fontweight='bold')
     
+    plt.tight_layout()
     output_path5 = os.path.join(output_dir, 'aggregate_quantile_analysis.png')
-    plt.savefig(output_path5, dpi=150, bbox_inches='tight')
+    plt.savefig(output_path5, dpi=150)
     print(f"✅ Saved: {output_path5}")
     plt.close()
+
+
+def capture_plot_output(plot_function, *args):
+    """Run one plot function in a worker and return what it printed"""
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        plot_function(*args)
+    return output.getvalue()
+
+
+def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
+    """
+    Create aggregate visualizations showing how Score moves with RET across all tickers.
+    
+    Args:
+        merged_file: Path to the merged data CSV file
+        output_dir: Directory to save the plot images
+        stats_output_file: Path to save the statistics CSV file
+    """
+    import os
+    
+    # Read the merged data
+    print(f"Reading {merged_file}...")
+    # Only the ticker, return and score columns are used (the headline text is by far the widest column).
+    # Score/RET are parsed straight to float64: the saved statistics are full-precision values, and
+    # RET carries more significant digits than float32 can hold
+    df = pd.read_csv(merged_file, usecols=lambda c: c in ANALYSIS_COLUMNS,
+                     dtype={'Score': np.float64, 'RET': np.float64})
+    
+    print(f"Total data points: {len(df)}")
+    print(f"Columns: {df.columns.tolist()}")
+    
+    # Everything below works on plain NumPy arrays of the columns; the frame is not used again
+    score_arr = df['Score'].to_numpy()
+    ret_arr = df['RET'].to_numpy()
+    ticker_arr = df['Ticker'].to_numpy() if 'Ticker' in df.columns else None
+    
+    # Clean data: remove NaN and infinite values
+    print(f"\nCleaning data...")
+    original_len = len(score_arr)
+    # One fused mask on the raw arrays (np.isfinite is also False for NaN)
+    valid = np.isfinite(score_arr) & np.isfinite(ret_arr)
+    if not valid.all():
+        score_arr = score_arr[valid]
+        ret_arr = ret_arr[valid]
+        if ticker_arr is not None:
+            ticker_arr = ticker_arr[valid]
+    n_obs = len(score_arr)
+    print(f"Removed {original_len - n_obs} rows with NaN/infinite values")
+    print(f"Remaining data points: {n_obs}")
+    
+    if n_obs == 0:
+        print("ERROR: No valid data remaining after cleaning!")
+        return
+    
+    # RET as percentage for display
+    ret_pct_arr = ret_arr * 100
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Calculate overall statistics once; the prints, plots and saved table below reuse them
+    # (the same functions Series.corr dispatches to for 'pearson' and 'spearman')
+    overall_corr = np.corrcoef(score_arr, ret_arr)[0, 1]
+    spearman_corr = stats.spearmanr(score_arr, ret_arr)[0]  # ranks both columns; do it once
+    score_stats = describe_array(score_arr)
+    ret_stats = describe_array(ret_pct_arr)
+    # One factorize pass over the tickers (NaN excluded, like nunique); reused by the table and the summary
+    n_tickers = len(pd.factorize(ticker_arr)[1]) if ticker_arr is not None else 'N/A'
+    
+    # Share of negative / zero / positive values; reused by the stats table and the summary
+    score_sign_pct = sign_shares(score_arr)
+    ret_sign_pct = sign_shares(ret_arr)
+    
+    print(f"\nOverall Pearson Correlation: {overall_corr:.4f}")
+    print(f"Mean Score: {score_stats['mean']:.4f}")
+    print(f"Mean RET: {ret_stats['mean']:.4f}%")
+    print(f"Std Score: {score_stats['std']:.4f}")
+    print(f"Std RET: {ret_stats['std']:.4f}%")
+    
+    # Row positions drawn by the raw-point scatters in Figures 3 and 4
+    rng = np.random.default_rng(0)
+    scatter_sample = rng.choice(n_obs, size=min(MAX_SCATTER_POINTS, n_obs), replace=False)
+    
+    # The reductions behind each figure are computed here; the five figures are then
+    # rendered in parallel from these inputs
+    print("\n" + "="*60)
+    print("Preparing figure data...")
+    
+    # ----- Figure 1: Binned Scatter Plot -----
+    # Group returns into bins and show average score for each bin
+    # Create return bins (every 2.5% or 0.025 in decimal)
+    bin_size = 0.025
+    min_ret = ret_arr.min()
+    max_ret = ret_arr.max()
+    bins = np.arange(np.floor(min_ret/bin_size)*bin_size, 
+                     np.ceil(max_ret/bin_size)*bin_size + bin_size, 
+                     bin_size)
+    
+    # Calculate statistics for each bin from bincount reductions over the bin index
+    # (bins are right-closed like pd.cut; values on or below the first edge fall outside)
+    bin_idx = np.searchsorted(bins, ret_arr, side='left') - 1
+    in_bins = (bin_idx >= 0) & (bin_idx < len(bins) - 1)
+    bin_idx = bin_idx[in_bins]
+    
+    # Keep only bins with enough observations before aggregating, remapped to dense indices
+    bin_counts = np.bincount(bin_idx, minlength=len(bins) - 1)
+    kept_bins = np.flatnonzero(bin_counts >= 5)
+    dense_idx = np.full(len(bin_counts), -1, dtype=np.intp)
+    dense_idx[kept_bins] = np.arange(len(kept_bins))
+    bin_idx = dense_idx[bin_idx]
+    kept_rows = bin_idx >= 0
+    bin_idx = bin_idx[kept_rows]
+    
+    count, score_mean, score_std = grouped_score_stats(bin_idx, score_arr[in_bins][kept_rows], len(kept_bins))
+    ret_sum = np.bincount(bin_idx, weights=ret_arr[in_bins][kept_rows], minlength=len(kept_bins))
+    bin_stats = pd.DataFrame({
+        'RET_bin': pd.IntervalIndex.from_breaks(bins)[kept_bins],
+        'Score_mean': score_mean,
+        'Score_std': score_std,
+        'Count': count,
+        'RET_mean': ret_sum / count,
+    })
+    bin_stats['Score_sem'] = bin_stats['Score_std'] / np.sqrt(bin_stats['Count'])  # Standard error
+    bin_stats['RET_mean_pct'] = bin_stats['RET_mean'] * 100
+    
+    # ----- Figure 2: 2D Density Heatmap -----
+    # Create 2D histogram (heatmap); the edges are evenly spaced, so bin by direct index arithmetic
+    ret_lo, ret_hi = ret_stats['min'], ret_stats['max']
+    h = uniform_histogram2d(ret_pct_arr, score_arr, (ret_lo, ret_hi), (-1, 1),
+                            bins=(39, 39))  # 40 evenly spaced edges on each axis
+    
+    # ----- Figure 3: Sorted Line Plot -----
+    # Sort by return and apply moving average to see trend
+    order = np.argsort(ret_arr)
+    score_sorted = score_arr[order]
+    ret_sorted = ret_arr[order]  # also reused for the deciles in Figure 5
+    ret_pct_sorted = ret_sorted * 100
+    window = max(50, n_obs // 100)  # Adaptive window size
+    
+    score_ma = centered_moving_average(score_sorted, window)
+    ret_pct_ma = centered_moving_average(ret_pct_sorted, window)
+    
+    # Raw points are drawn on a sorted uniform sample of positions
+    sample_pos = np.sort(scatter_sample)
+    
+    # ----- Figure 5: Quantile Analysis -----
+    # Divide returns into quantiles and compare scores
+    # Decile edges come from pd.qcut itself (duplicate edges dropped, bins closed on the right);
+    # each decile is then a contiguous run of the return-sorted arrays from Figure 3
+    edges = pd.qcut(ret_sorted, 10, labels=False, retbins=True, duplicates='drop')[1]
+    bin_end = np.searchsorted(ret_sorted, edges[1:], side='right')
+    bin_start = np.concatenate(([0], bin_end[:-1]))
+    nquintiles = len(bin_end)
+    quintile_idx = np.repeat(np.arange(nquintiles), bin_end - bin_start)
+    count, score_mean, score_std = grouped_score_stats(quintile_idx, score_sorted, nquintiles)
+    observed = count > 0
+    quintile_stats = pd.DataFrame({
+        'Quintile': np.flatnonzero(observed),
+        'RET_mean': np.bincount(quintile_idx, weights=ret_sorted, minlength=nquintiles)[observed] / count[observed],
+        'RET_min': ret_sorted[bin_start[observed]],
+        'RET_max': ret_sorted[bin_end[observed] - 1],
+        'Score_mean': score_mean[observed],
+        'Score_std': score_std[observed],
+        'Count': count[observed],
+    })
+    quintile_stats['RET_mean_pct'] = quintile_stats['RET_mean'] * 100
+    quintile_stats['Score_sem'] = quintile_stats['Score_std'] / np.sqrt(quintile_stats['Count'])
+    
+    # ===== VISUALIZATIONS =====
+    # Render each figure in a separate process (figures are independent and Agg rendering
+    # is CPU-bound); Figure 4 builds its own scatter and marginals from the full arrays
+    print("\n" + "="*60)
+    print("Creating figures...")
+    with ProcessPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(capture_plot_output, plot_binned_analysis, bin_stats, output_dir),
+            executor.submit(capture_plot_output, plot_density_heatmap, h, ret_lo, ret_hi, overall_corr, output_dir),
+            executor.submit(capture_plot_output, plot_sorted_movement, sample_pos, ret_pct_sorted[sample_pos],
+                            score_sorted[sample_pos], ret_pct_ma, score_ma, window, output_dir),
+            executor.submit(capture_plot_output, plot_joint_distribution, ret_pct_arr, score_arr, scatter_sample,
+                            ret_stats, overall_corr, output_dir),
+            executor.submit(capture_plot_output, plot_quantile_analysis, quintile_stats, output_dir),
+        ]
+        # Print each figure's output in figure order (re-raises any rendering error here)
+        for future in futures:
+            print(future.result(), end='')
     
     # ===== Save Statistics =====
     print("\n" + "="*60)
@@ -336,25 +622,25 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
                    'Positive_Scores_pct', 'Negative_Scores_pct', 'Neutral_Scores_pct',
                    'Positive_Returns_pct', 'Negative_Returns_pct'],
         'Value': [
-            len(df),
-            df['Ticker'].nunique() if 'Ticker' in df.columns else 'N/A',
+            n_obs,
+            n_tickers,
             overall_corr,
-            df['Score'].corr(df['RET'], method='spearman'),
-            df['Score'].mean(),
-            df['Score'].median(),
-            df['Score'].std(),
-            df['RET_pct'].mean(),
-            df['RET_pct'].median(),
-            df['RET_pct'].std(),
-            df['Score'].min(),
-            df['Score'].max(),
-            df['RET_pct'].min(),
-            df['RET_pct'].max(),
-            (df['Score'] > 0).sum() / len(df) * 100,
-            (df['Score'] < 0).sum() / len(df) * 100,
-            (df['Score'] == 0).sum() / len(df) * 100,
-            (df['RET'] > 0).sum() / len(df) * 100,
-            (df['RET'] < 0).sum() / len(df) * 100
+            spearman_corr,
+            score_stats['mean'],
+            score_stats['median'],
+            score_stats['std'],
+            ret_stats['mean'],
+            ret_stats['median'],
+            ret_stats['std'],
+            score_stats['min'],
+            score_stats['max'],
+            ret_stats['min'],
+            ret_stats['max'],
+            score_sign_pct[2],
+            score_sign_pct[0],
+            score_sign_pct[1],
+            ret_sign_pct[2],
+            ret_sign_pct[0]
         ]
     }
     
@@ -366,26 +652,26 @@ def create_aggregate_analysis(merged_file, output_dir, stats_output_file):
     print("\n" + "="*60)
     print("AGGREGATE ANALYSIS SUMMARY")
     print("="*60)
-    print(f"Total Observations: {len(df):,}")
-    if 'Ticker' in df.columns:
-        print(f"Unique Tickers: {df['Ticker'].nunique()}")
+    print(f"Total Observations: {n_obs:,}")
+    if ticker_arr is not None:
+        print(f"Unique Tickers: {n_tickers}")
     print(f"\nPearson Correlation: {overall_corr:.4f}")
-    print(f"Spearman Correlation: {df['Score'].corr(df['RET'], method='spearman'):.4f}")
+    print(f"Spearman Correlation: {spearman_corr:.4f}")
     print(f"\nScore Distribution:")
-    print(f"  Mean: {df['Score'].mean():.4f}")
-    print(f"  Median: {df['Score'].median():.4f}")
-    print(f"  Std Dev: {df['Score'].std():.4f}")
-    print(f"  Range: [{df['Score'].min():.4f}, {df['Score'].max():.4f}]")
-    print(f"  Positive: {(df['Score'] > 0).sum() / len(df) * 100:.2f}%")
-    print(f"  Negative: {(df['Score'] < 0).sum() / len(df) * 100:.2f}%")
-    print(f"  Neutral: {(df['Score'] == 0).sum() / len(df) * 100:.2f}%")
+    print(f"  Mean: {score_stats['mean']:.4f}")
+    print(f"  Median: {score_stats['median']:.4f}")
+    print(f"  Std Dev: {score_stats['std']:.4f}")
+    print(f"  Range: [{score_stats['min']:.4f}, {score_stats['max']:.4f}]")
+    print(f"  Positive: {score_sign_pct[2]:.2f}%")
+    print(f"  Negative: {score_sign_pct[0]:.2f}%")
+    print(f"  Neutral: {score_sign_pct[1]:.2f}%")
     print(f"\nReturn Distribution:")
-    print(f"  Mean: {df['RET_pct'].mean():.4f}%")
-    print(f"  Median: {df['RET_pct'].median():.4f}%")
-    print(f"  Std Dev: {df['RET_pct'].std():.4f}%")
-    print(f"  Range: [{df['RET_pct'].min():.4f}%, {df['RET_pct'].max():.4f}%]")
-    print(f"  Positive: {(df['RET'] > 0).sum() / len(df) * 100:.2f}%")
-    print(f"  Negative: {(df['RET'] < 0).sum() / len(df) * 100:.2f}%")
+    print(f"  Mean: {ret_stats['mean']:.4f}%")
+    print(f"  Median: {ret_stats['median']:.4f}%")
+    print(f"  Std Dev: {ret_stats['std']:.4f}%")
+    print(f"  Range: [{ret_stats['min']:.4f}%, {ret_stats['max']:.4f}%]")
+    print(f"  Positive: {ret_sign_pct[2]:.2f}%")
+    print(f"  Negative: {ret_sign_pct[0]:.2f}%")
     print("="*60)
     
     print(f"\n✅ Successfully created 5 aggregate visualizations")
@@ -1,7 +1,49 @@
 # average_monthly_scores.py
 import pandas as pd
+import numpy as np
 import os
 
+# Columns used from the merged daily data
+INPUT_COLUMNS = ['Ticker', 'Date', 'RET', 'Score']
+
+# Rows read per chunk; only per (Ticker, month) sums and counts are kept between chunks
+CHUNK_ROWS = 100000
+
+def monthly_sums(chunk):
+    """
+    Per (Ticker, YearMonth) sums and non-NaN counts of RET and Score for one chunk.
+    
+    Ticker and month are factorized into a single integer key, so the reductions run on
+    integer codes instead of hashing compound (Ticker, Period) keys. Counts come from
+    np.bincount; sums use a groupby on the integer key, which keeps pandas' compensated
+    summation so the rounded averages match a plain groupby mean. Rows with a missing
+    ticker or date are dropped, as groupby would.
+    
+    Returns:
+        DataFrame indexed by (Ticker, YearMonth 'YYYY-MM') with (column, 'sum'/'count') columns
+    """
+    ticker_id, tickers = pd.factorize(chunk['Ticker'])
+    dates = pd.to_datetime(chunk['Date']).to_numpy()
+    valid = (ticker_id >= 0) & ~np.isnat(dates)
+    month_id, months = pd.factorize(dates[valid].astype('datetime64[M]'))
+    key = ticker_id[valid].astype(np.int64) * len(months) + month_id
+    
+    values = chunk.loc[valid, ['RET', 'Score']]
+    sums = values.groupby(key).sum()
+    present = sums.index.to_numpy()
+    
+    partial = {}
+    for col in ['RET', 'Score']:
+        partial[(col, 'sum')] = sums[col].to_numpy()
+        partial[(col, 'count')] = np.bincount(key, weights=values[col].notna().to_numpy())[present]
+    
+    index = pd.MultiIndex.from_arrays(
+        [tickers[present // len(months)],
+         np.datetime_as_string(months[present % len(months)], unit='M')],
+        names=['Ticker', 'YearMonth'])
+    return pd.DataFrame(partial, index=index)
+
+
 def average_monthly_scores(input_file, output_file):
     """
     Average Score and RET by Ticker and month.
@@ -10,30 +52,27 @@ def average_monthly_scores(input_file, output_file):
         input_file: Path to input CSV (e.g., Merged_Data_v6.csv)
         output_file: Path to output CSV (e.g., Monthly_Averaged_Score_v6.csv)
     """
-    # Read the data
-    df = pd.read_csv(input_file)
-    
-    print(f"Loaded {len(df)} rows from {input_file}")
-    print(f"Columns: {df.columns.tolist()}")
-    
-    # Convert date to datetime
-    df['Date'] = pd.to_datetime(df['Date'])
+    # Stream the data in chunks, accumulating sums and counts per Ticker and YearMonth
+    # so the full daily file never has to be held in memory
+    partials = []
+    n_rows = 0
+    for chunk in pd.read_csv(input_file, usecols=INPUT_COLUMNS, chunksize=CHUNK_ROWS):
+        n_rows += len(chunk)
+        partials.append(monthly_sums(chunk))
     
-    # Extract year-month
-    df['YearMonth'] = df['Date'].dt.to_period('M')
+    print(f"Loaded {n_rows} rows from {input_file}")
+    print(f"Columns: {INPUT_COLUMNS}")
     
-    # Group by Ticker and YearMonth, then average Score and RET
-    monthly_avg = df.groupby(['Ticker', 'YearMonth']).agg({
-        'RET': 'mean',
-        'Score': 'mean'
-    }).reset_index()
+    # Combine the chunk partials, then average Score and RET (count skips NaN, like mean)
+    totals = pd.concat(partials).groupby(level=['Ticker', 'YearMonth']).sum()
+    monthly_avg = (totals.xs('sum', axis=1, level=1) / totals.xs('count', axis=1, level=1)).reset_index()
     
     # Round to 3 decimal places
     monthly_avg['RET'] = monthly_avg['RET'].round(3)
     monthly_avg['Score'] = monthly_avg['Score'].round(3)
     
-    # Convert YearMonth back to string format (YYYY-MM)
-    monthly_avg['Date'] = monthly_avg['YearMonth'].astype(str)
+    # YearMonth is already in string format (YYYY-MM)
+    monthly_avg['Date'] = monthly_avg['YearMonth']
     
     # Drop the YearMonth column and reorder
     monthly_avg = monthly_avg[['Ticker', 'Date', 'RET', 'Score']]
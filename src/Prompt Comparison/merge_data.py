@@ -1,5 +1,5 @@
 import pandas as pd
-from datetime import timedelta
+from pandas.api.types import union_categoricals
 import os
 
 # Get project root (go up two levels from src/Prompt Comparison/)
@@ -11,6 +11,13 @@ DECISION_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing Phase',
 RETURNS_FILE = os.path.join(project_root, 'data', 'data (sample and setup)', 'Full_TestData_DailyReturns.csv')
 OUTPUT_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing Phase', 'Merged Data (Test Data - Prompt Evaluation)', 'Merged_Data_v6(Full-Test_Data)_non-adjusted.csv')
 
+# Columns read from each input (any spelling of the ticker column is accepted)
+DECISION_COLUMNS = {'Ticker', 'ticker', 'Date', 'Headline', 'Score'}
+RETURNS_COLUMNS = {'TICKER', 'Ticker', 'ticker', 'date', 'PRC', 'RET'}
+
+# Rows formatted per write when exporting CSV (keeps the formatted text buffer bounded)
+CSV_CHUNK_ROWS = 50000
+
 def merge_datasets(decision_file, returns_file, output_file):
     """
     Merge decision and returns datasets based on ticker and adjusted date.
@@ -23,22 +30,17 @@ def merge_datasets(decision_file, returns_file, output_file):
     
     # Read the datasets
     print(f"Reading {decision_file}...")
-    decision_df = pd.read_csv(decision_file)
+    decision_df = pd.read_csv(decision_file, usecols=lambda c: c in DECISION_COLUMNS, parse_dates=['Date'])
     
     print(f"Reading {returns_file}...")
-    returns_df = pd.read_csv(returns_file)
+    returns_df = pd.read_csv(returns_file, usecols=lambda c: c in RETURNS_COLUMNS, parse_dates=['date'])
     
     # Display original counts
     print(f"\nOriginal rows - Decision: {len(decision_df)}, Returns: {len(returns_df)}")
     
-    # Standardize column names for merging
-    # Convert date columns to datetime
-    decision_df['Date'] = pd.to_datetime(decision_df['Date'])
-    returns_df['date'] = pd.to_datetime(returns_df['date'])
-    
     # Add 1 day to Decision_Testing dates
     print("\nAdding 1 day to Decision_Testing dates...")
-    decision_df['Date_Adjusted'] = decision_df['Date'] + timedelta(days=1) # No need to adjust for daily data - comment after '+'
+    decision_df['Date_Adjusted'] = decision_df['Date'] + pd.Timedelta(days=1) # No need to adjust for daily data - comment after '+'
     
     # Standardize ticker column names for merging
     # Check which column name is used
@@ -54,11 +56,19 @@ def merge_datasets(decision_file, returns_file, output_file):
     else:
         returns_df['ticker_merge'] = returns_df['ticker']
     
+    # Encode the ticker key on both sides with one shared (sorted) category set
+    ticker_dtype = pd.CategoricalDtype(union_categoricals(
+        [decision_df['ticker_merge'].astype('category'), returns_df['ticker_merge'].astype('category')],
+        sort_categories=True).categories)
+    decision_df['ticker_merge'] = decision_df['ticker_merge'].astype(ticker_dtype)
+    returns_df['ticker_merge'] = returns_df['ticker_merge'].astype(ticker_dtype)
+    
     # Merge the datasets on ticker and adjusted date
+    # (project each side to the columns kept in the output so the join doesn't carry the rest)
     print("\nMerging datasets on ticker and adjusted date...")
     merged_df = pd.merge(
-        decision_df,
-        returns_df,
+        decision_df[['ticker_merge', 'Date_Adjusted', 'Headline', 'Score']],
+        returns_df[['ticker_merge', 'date', 'PRC', 'RET']],
         left_on=['ticker_merge', 'Date_Adjusted'],
         right_on=['ticker_merge', 'date'],
         how='inner'
@@ -78,7 +88,7 @@ def merge_datasets(decision_file, returns_file, output_file):
     
     # Save the merged dataset
     print(f"\nSaving merged data to {output_file}...")
-    output_df.to_csv(output_file, index=False)
+    output_df.to_csv(output_file, index=False, chunksize=CSV_CHUNK_ROWS)
     
     print(f"✅ Successfully saved {len(output_df)} rows to {output_file}")
     
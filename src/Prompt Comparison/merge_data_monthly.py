@@ -1,6 +1,6 @@
 # merge_data_monthly.py
 import pandas as pd
-from pandas.tseries.offsets import DateOffset
+from pandas.api.types import union_categoricals
 import os
 
 # Get project root (go up two levels from src/Prompt Comparison/)
@@ -12,6 +12,18 @@ MONTHLY_SCORES_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing P
 MONTHLY_RETURNS_FILE = os.path.join(project_root, 'data', 'data (sample and setup)', 'Full_TestData_MonthlyReturns.csv')
 OUTPUT_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing Phase', 'Merged Data (Test Data - Prompt Evaluation)', 'Merged_Monthly_Data_v6(Full-Test_Data).csv')
 
+# Columns read from the returns file (matched case-insensitively), besides the detected date column
+RETURNS_COLUMNS = {'date', 'month', 'yearmonth', 'ticker', 'ret'}
+
+# Rows formatted per write when exporting CSV (keeps the formatted text buffer bounded)
+CSV_CHUNK_ROWS = 50000
+
+def find_column(df, names):
+    """Return the first column of df whose lower-cased name is in names, or None."""
+    matches = df.columns[df.columns.str.lower().isin(names)]
+    return matches[0] if len(matches) > 0 else None
+
+
 def merge_monthly_datasets(monthly_scores_file, monthly_returns_file, output_file):
     """
     Merge monthly averaged scores and monthly returns datasets based on ticker and adjusted month.
@@ -24,30 +36,26 @@ def merge_monthly_datasets(monthly_scores_file, monthly_returns_file, output_fil
     
     # Read the datasets
     print(f"Reading {monthly_scores_file}...")
-    scores_df = pd.read_csv(monthly_scores_file)
+    scores_df = pd.read_csv(monthly_scores_file, usecols=['Ticker', 'Date', 'RET', 'Score'],
+                            parse_dates=['Date'], date_format='%Y-%m')
     
     print(f"Reading {monthly_returns_file}...")
-    returns_df = pd.read_csv(monthly_returns_file)
+    # Check the date column name in the returns header before choosing which columns to read
+    returns_header = pd.read_csv(monthly_returns_file, nrows=0)
+    date_col_returns = find_column(returns_header, ['date', 'month', 'yearmonth'])
+    
+    if date_col_returns is None:
+        print("Warning: Could not find date column in returns file. Using first column.")
+        date_col_returns = returns_header.columns[0]
+    
+    returns_df = pd.read_csv(monthly_returns_file,
+                             usecols=lambda c: c.lower() in RETURNS_COLUMNS or c == date_col_returns)
     
     # Display original counts
     print(f"\nOriginal rows - Monthly Scores: {len(scores_df)}, Monthly Returns: {len(returns_df)}")
     print(f"Scores columns: {scores_df.columns.tolist()}")
     print(f"Returns columns: {returns_df.columns.tolist()}")
     
-    # Convert date columns to datetime
-    scores_df['Date'] = pd.to_datetime(scores_df['Date'], format='%Y-%m')
-    
-    # Check the date column name in returns_df
-    date_col_returns = None
-    for col in returns_df.columns:
-        if col.lower() in ['date', 'month', 'yearmonth']:
-            date_col_returns = col
-            break
-    
-    if date_col_returns is None:
-        print("Warning: Could not find date column in returns file. Using first column.")
-        date_col_returns = returns_df.columns[0]
-    
     # Parse date from returns file (may be YYYY-MM-DD format, convert to month)
     returns_df['date'] = pd.to_datetime(returns_df[date_col_returns])
     # Extract year-month only for matching
@@ -55,7 +63,7 @@ def merge_monthly_datasets(monthly_scores_file, monthly_returns_file, output_fil
     
     # Add 1 month to Monthly Scores dates (handles year transitions automatically)
     print("\nAdding 1 month to Monthly Scores dates...")
-    scores_df['Date_Adjusted'] = scores_df['Date'] + DateOffset(months=1)
+    scores_df['Date_Adjusted'] = (scores_df['Date'].dt.to_period('M') + 1).dt.to_timestamp()
     
     print(f"Sample date adjustments:")
     print(f"  Original: {scores_df['Date'].iloc[0].strftime('%Y-%m')} -> Adjusted: {scores_df['Date_Adjusted'].iloc[0].strftime('%Y-%m')}")
@@ -63,17 +71,8 @@ def merge_monthly_datasets(monthly_scores_file, monthly_returns_file, output_fil
         print(f"  Original: {scores_df['Date'].iloc[5].strftime('%Y-%m')} -> Adjusted: {scores_df['Date_Adjusted'].iloc[5].strftime('%Y-%m')}")
     
     # Standardize ticker column names for merging
-    ticker_col_scores = None
-    for col in scores_df.columns:
-        if col.lower() == 'ticker':
-            ticker_col_scores = col
-            break
-    
-    ticker_col_returns = None
-    for col in returns_df.columns:
-        if col.lower() == 'ticker':
-            ticker_col_returns = col
-            break
+    ticker_col_scores = find_column(scores_df, ['ticker'])
+    ticker_col_returns = find_column(returns_df, ['ticker'])
     
     if ticker_col_scores:
         scores_df['ticker_merge'] = scores_df[ticker_col_scores]
@@ -87,6 +86,13 @@ def merge_monthly_datasets(monthly_scores_file, monthly_returns_file, output_fil
         print("Error: No ticker column found in returns file!")
         return
     
+    # Encode the ticker key on both sides with one shared (sorted) category set
+    ticker_dtype = pd.CategoricalDtype(union_categoricals(
+        [scores_df['ticker_merge'].astype('category'), returns_df['ticker_merge'].astype('category')],
+        sort_categories=True).categories)
+    scores_df['ticker_merge'] = scores_df['ticker_merge'].astype(ticker_dtype)
+    returns_df['ticker_merge'] = returns_df['ticker_merge'].astype(ticker_dtype)
+    
     # Merge the datasets on ticker and adjusted month
     print("\nMerging datasets on ticker and adjusted month...")
     merged_df = pd.merge(
@@ -103,7 +109,7 @@ def merge_monthly_datasets(monthly_scores_file, monthly_returns_file, output_fil
     
     # Select and rename columns to keep
     output_df = pd.DataFrame({
-        'Date': merged_df['date_month'].dt.strftime('%Y-%m'),  # Use the date from returns (already adjusted)
+        'Date': merged_df['date_month'],  # Use the date from returns (already adjusted)
         'Ticker': merged_df['ticker_merge'],
         'RET (monthly)': merged_df['RET_monthly'],
         'RET (daily-averaged)': merged_df['RET_daily'],
@@ -115,12 +121,16 @@ def merge_monthly_datasets(monthly_scores_file, monthly_returns_file, output_fil
     output_df['RET (daily-averaged)'] = output_df['RET (daily-averaged)'].round(3)
     output_df['Score'] = output_df['Score'].round(3)
     
-    # Sort by Ticker and Date
-    output_df = output_df.sort_values(['Ticker', 'Date'])
+    # Sort by Ticker and Date, then format the month for export
+    output_df = output_df.sort_values(['Ticker', 'Date'], kind='stable')
+    output_df['Date'] = output_df['Date'].dt.strftime('%Y-%m')
     
     # Save the merged dataset
     print(f"\nSaving merged data to {output_file}...")
-    output_df.to_csv(output_file, index=False)
+    output_df.to_csv(output_file, index=False, chunksize=CSV_CHUNK_ROWS)
+    
+    # Binary cache of the merged frame for plot_data_monthly.py (the CSV stays the export format)
+    output_df.to_pickle(os.path.splitext(output_file)[0] + '.pkl')
     
     print(f"✅ Successfully saved {len(output_df)} rows to {output_file}")
     
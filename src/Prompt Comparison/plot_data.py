@@ -201,7 +201,8 @@ def plot_ticker_data(merged_file, output_dir, stats_output_file):
         
         # Save the plot
         output_path = os.path.join(output_dir, f'{ticker}_plot.png')
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
+        # The grid spec already fixes the layout, so skip the extra bbox_inches='tight' pass
+        plt.savefig(output_path, dpi=150)
         print(f"  ✅ Saved plot to {output_path}")
         
         # Close the figure to free memory
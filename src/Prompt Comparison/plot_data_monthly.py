@@ -1,10 +1,15 @@
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; figures are only saved to disk
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from datetime import datetime
 import numpy as np
 from scipy import stats
 import os
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 
 # Get project root (go up two levels from src/Prompt Comparison/)
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,6 +20,165 @@ MERGED_DATA_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing Phas
 OUTPUT_DIR = os.path.join(project_root, 'Figures and Tables', 'Plots Used For Prompt Evaluation', 'plots_monthly_v6(Full-Test_Data)')
 STATS_OUTPUT_FILE = os.path.join(project_root, 'Statistics', 'Prompt Testing Phase', 'Score Statistics Used For Prompt Evaluation', 'Plot_Statistics_Monthly_v6(Full-Test_Data).csv')
 
+# Columns used from the merged monthly data
+MERGED_COLUMNS = ['Date', 'Ticker', 'RET (monthly)', 'Score']
+
+# Above this many points the per-ticker scatter is drawn as a hexbin density instead
+MAX_SCATTER_POINTS = 2000
+
+# Processes rendering ticker figures at once (each holds an open matplotlib figure)
+PLOT_WORKERS = min(4, os.cpu_count() or 1)
+
+def plot_single_ticker(ticker, ticker_df, ticker_stats, slope, intercept, output_dir):
+    """
+    Create and save the monthly analysis figure for one ticker.
+    
+    Args:
+        ticker: Ticker symbol
+        ticker_df: Rows for this ticker, sorted by Date, with the derived
+            RET/RET_pct/*_normalized/rolling_corr columns
+        ticker_stats: Precomputed summary statistics for the ticker (dict)
+        slope, intercept: Trend-line coefficients for the Score vs RET_pct scatter
+        output_dir: Directory to save the plot image
+    """
+    print(f"\nCreating plot for {ticker}...")
+    
+    # Plain NumPy views of the columns used below (no copy, no column inserts)
+    dates = ticker_df['Date'].to_numpy()
+    score = ticker_df['Score'].to_numpy()
+    ret_pct = ticker_df['RET_pct'].to_numpy()
+    rolling_corr = ticker_df['rolling_corr'].to_numpy()
+    
+    # Create figure with 3 subplots
+    fig = plt.figure(figsize=(16, 12))
+    gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
+    
+    # Subplot 1: Raw values (RET as percentage vs Score)
+    ax1 = fig.add_subplot(gs[0, :])
+    color1 = 'tab:blue'
+    ax1.set_xlabel('Date', fontsize=11)
+    ax1.set_ylabel('Monthly RET (%)', color=color1, fontsize=11)
+    line1 = ax1.plot(dates, ret_pct, 
+                     color=color1, linewidth=2, marker='o', markersize=4,
+                     label='Monthly Return (%)', alpha=0.7)
+    ax1.tick_params(axis='y', labelcolor=color1)
+    ax1.grid(True, alpha=0.3)
+    ax1.axhline(y=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
+    
+    ax1_twin = ax1.twinx()
+    color2 = 'tab:red'
+    ax1_twin.set_ylabel('Score', color=color2, fontsize=11)
+    line2 = ax1_twin.plot(dates, score, 
+                          color=color2, linewidth=2, marker='s', markersize=4,
+                          label='Avg Score', alpha=0.7)
+    ax1_twin.tick_params(axis='y', labelcolor=color2)
+    ax1_twin.axhline(y=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
+    ax1_twin.set_ylim(-1.1, 1.1)  # Fix Score axis
+    
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    ax1.set_title(f'{ticker} - Raw Values: Monthly Returns (%) vs Sentiment Score', fontsize=12, fontweight='bold')
+    
+    lines = line1 + line2
+    labels = [l.get_label() for l in lines]
+    ax1.legend(lines, labels, loc='upper left')
+    
+    # Subplot 2: Normalized values (z-scores)
+    ax2 = fig.add_subplot(gs[1, :])
+    ax2.plot(dates, ticker_df['RET_normalized'].to_numpy(), 
+            color='tab:blue', linewidth=2, marker='o', markersize=4,
+            label='Return (Normalized)', alpha=0.7)
+    ax2.plot(dates, ticker_df['Score_normalized'].to_numpy(), 
+            color='tab:red', linewidth=2, marker='s', markersize=4,
+            label='Score (Normalized)', alpha=0.7)
+    ax2.set_xlabel('Date', fontsize=11)
+    ax2.set_ylabel('Z-Score (Standard Deviations from Mean)', fontsize=11)
+    ax2.grid(True, alpha=0.3)
+    ax2.axhline(y=0, color='gray', linestyle='--', linewidth=0.8)
+    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    ax2.set_title(f'{ticker} - Normalized Values (Z-Scores)', fontsize=12, fontweight='bold')
+    ax2.legend(loc='upper left')
+    
+    # Subplot 3: Scatter plot with correlation
+    ax3 = fig.add_subplot(gs[2, 0])
+    if len(score) > MAX_SCATTER_POINTS:
+        ax3.hexbin(score, ret_pct, gridsize=40, cmap='viridis', mincnt=1)
+    else:
+        ax3.scatter(score, ret_pct, 
+                   alpha=0.6, s=80, c=range(len(score)), cmap='viridis', rasterized=True)
+    
+    # Add trend line
+    ax3.plot(score, slope * score + intercept, 
+            "r--", linewidth=2, alpha=0.8, label=f'Trend: y={slope:.2f}x+{intercept:.2f}')
+    
+    ax3.set_xlabel('Score', fontsize=11)
+    ax3.set_ylabel('Monthly RET (%)', fontsize=11)
+    ax3.grid(True, alpha=0.3)
+    ax3.axhline(y=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
+    ax3.axvline(x=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
+    
+    correlation = ticker_stats['Correlation']
+    ax3.set_title(f'Scatter Plot (Correlation: {correlation:.3f})', fontsize=12, fontweight='bold')
+    ax3.legend()
+    
+    # Subplot 4: Rolling correlation
+    ax4 = fig.add_subplot(gs[2, 1])
+    if not np.isnan(rolling_corr).all():
+        ax4.plot(dates, rolling_corr, 
+                color='tab:purple', linewidth=2, marker='o', markersize=4)
+        ax4.axhline(y=0, color='gray', linestyle='--', linewidth=0.8)
+        ax4.set_ylim(-1.1, 1.1)
+        ax4.fill_between(dates, 0, rolling_corr, 
+                        where=(rolling_corr >= 0), 
+                        color='green', alpha=0.3, interpolate=True)
+        ax4.fill_between(dates, 0, rolling_corr, 
+                        where=(rolling_corr < 0), 
+                        color='red', alpha=0.3, interpolate=True)
+    else:
+        ax4.text(0.5, 0.5, 'Insufficient data\nfor rolling correlation\n(need at least 3 months)', 
+                ha='center', va='center', fontsize=12, transform=ax4.transAxes)
+    
+    ax4.set_xlabel('Date', fontsize=11)
+    ax4.set_ylabel('Rolling Correlation (3-month window)', fontsize=11)
+    ax4.grid(True, alpha=0.3)
+    ax4.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    ax4.set_title(f'Rolling Correlation Over Time', fontsize=12, fontweight='bold')
+    
+    # Add overall statistics
+    stats_text = f'Monthly Statistics:\n'
+    stats_text += f'Data Points: {ticker_stats["Data_Points"]} months\n'
+    stats_text += f'Avg RET: {ticker_stats["Avg_Monthly_RET_Pct"]:.3f}%\n'
+    stats_text += f'Avg Score: {ticker_stats["Avg_Score"]:.3f}\n'
+    stats_text += f'Correlation: {correlation:.3f}\n'
+    stats_text += f'Date Range:\n{ticker_stats["Date_Start"]} to\n{ticker_stats["Date_End"]}'
+    
+    fig.text(0.98, 0.02, stats_text, fontsize=9, 
+            verticalalignment='bottom', horizontalalignment='right',
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+    
+    # Main title
+    fig.suptitle(f'{ticker} - Monthly Analysis: Returns vs Sentiment Score', 
+                fontsize=14, fontweight='bold', y=0.995)
+    
+    # Save the plot
+    output_path = os.path.join(output_dir, f'{ticker}_monthly_plot.png')
+    # The grid spec already fixes the layout, so skip the extra bbox_inches='tight' pass
+    fig.savefig(output_path, dpi=150)
+    print(f"  ✅ Saved plot to {output_path}")
+    
+    # Close the figure to free memory
+    plt.close(fig)
+
+
+def capture_plot_output(plot_function, *args):
+    """Run one plot function in a worker and return what it printed"""
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        plot_function(*args)
+    return output.getvalue()
+
+
 def plot_ticker_data_monthly(merged_file, output_dir, stats_output_file):
     """
     Create line plots for each ticker showing monthly RET and Score over time.
@@ -28,15 +192,67 @@ def plot_ticker_data_monthly(merged_file, output_dir, stats_output_file):
     
     # Read the merged data
     print(f"Reading {merged_file}...")
-    df = pd.read_csv(merged_file)
+    # Prefer the binary cache written by merge_data_monthly.py when it is at least as new as the CSV
+    cache_file = os.path.splitext(merged_file)[0] + '.pkl'
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(merged_file):
+        df = pd.read_pickle(cache_file)[MERGED_COLUMNS]
+        df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m')
+    else:
+        # Parse the monthly dates (YYYY-MM) while reading
+        df = pd.read_csv(merged_file, usecols=MERGED_COLUMNS, parse_dates=['Date'], date_format='%Y-%m')
     
     print(f"Columns: {df.columns.tolist()}")
     
-    # Convert date to datetime (monthly format YYYY-MM)
-    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m')
+    df['Ticker'] = df['Ticker'].astype('category')
+    
+    # Sort by ticker, then date (oldest to newest) so each group comes out ordered
+    df = df.sort_values(['Ticker', 'Date'])
+    
+    # Use monthly RET for primary analysis
+    df['RET'] = df['RET (monthly)']
+    
+    # Normalize data for better comparison
+    # Z-score normalization per ticker (standardize to mean=0, std=1)
+    for col in ['RET', 'Score']:
+        grouped = df.groupby('Ticker', observed=True)[col]
+        df[f'{col}_normalized'] = (df[col] - grouped.transform('mean')) / grouped.transform('std')
+    
+    # Convert RET to percentage for raw display
+    df['RET_pct'] = df['RET'] * 100
+    
+    # Calculate rolling correlation (3-month window for monthly data) for all tickers at once;
+    # tickers with fewer than 3 months come out all-NaN
+    rolling_corr = df.groupby('Ticker', observed=True)[['RET', 'Score']].rolling(window=3).corr()
+    df['rolling_corr'] = rolling_corr.xs('Score', level=-1)['RET'].droplevel('Ticker')
+    
+    # Trend-line (OLS of RET_pct on Score) coefficients for every ticker from grouped sums
+    means = df.groupby('Ticker', observed=True)[['Score', 'RET_pct']].mean()
+    dx = df['Score'] - df.groupby('Ticker', observed=True)['Score'].transform('mean')
+    dy = df['RET_pct'] - df.groupby('Ticker', observed=True)['RET_pct'].transform('mean')
+    sums = pd.DataFrame({'xy': dx * dy, 'xx': dx * dx}).groupby(df['Ticker'], observed=True).sum()
+    trend_slope = sums['xy'] / sums['xx']
+    trend_intercept = means['RET_pct'] - trend_slope * means['Score']
     
-    # Sort by date (oldest to newest)
-    df = df.sort_values('Date')
+    # Summary statistics for all tickers in one grouped aggregation
+    grouped = df.groupby('Ticker', sort=True, observed=True)
+    stats_df = grouped.agg(
+        Data_Points=('RET', 'size'),
+        Avg_Monthly_RET=('RET', 'mean'),
+        Avg_Score=('Score', 'mean'),
+        Date_Start=('Date', 'min'),
+        Date_End=('Date', 'max'),
+        RET_StdDev=('RET', 'std'),
+        Score_StdDev=('Score', 'std'),
+        Min_RET=('RET', 'min'),
+        Max_RET=('RET', 'max'),
+        Min_Score=('Score', 'min'),
+        Max_Score=('Score', 'max'),
+    )
+    stats_df.insert(2, 'Avg_Monthly_RET_Pct', stats_df['Avg_Monthly_RET'] * 100)
+    stats_df.insert(4, 'Correlation', grouped[['Score', 'RET']].corr().xs('Score', level=-1)['RET'])
+    stats_df['Date_Start'] = stats_df['Date_Start'].dt.strftime('%Y-%m')
+    stats_df['Date_End'] = stats_df['Date_End'].dt.strftime('%Y-%m')
+    stats_df = stats_df.reset_index()
     
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -46,176 +262,25 @@ def plot_ticker_data_monthly(merged_file, output_dir, stats_output_file):
     print(f"\nFound {len(tickers)} unique tickers")
     print(f"Tickers: {', '.join(sorted(tickers))}")
     
-    # List to collect statistics for all tickers
-    all_stats = []
-    
-    # Create a plot for each ticker
-    for ticker in sorted(tickers):
-        print(f"\nCreating plot for {ticker}...")
-        
-        # Filter data for this ticker
-        ticker_df = df[df['Ticker'] == ticker].copy()
-        ticker_df = ticker_df.sort_values('Date')
-        
-        # Use monthly RET for primary analysis
-        ticker_df['RET'] = ticker_df['RET (monthly)']
-        
-        # Normalize data for better comparison
-        # Z-score normalization (standardize to mean=0, std=1)
-        ticker_df['RET_normalized'] = (ticker_df['RET'] - ticker_df['RET'].mean()) / ticker_df['RET'].std()
-        ticker_df['Score_normalized'] = (ticker_df['Score'] - ticker_df['Score'].mean()) / ticker_df['Score'].std()
-        
-        # Convert RET to percentage for raw display
-        ticker_df['RET_pct'] = ticker_df['RET'] * 100
-        
-        # Calculate rolling correlation (3-month window for monthly data)
-        if len(ticker_df) >= 3:
-            ticker_df['rolling_corr'] = ticker_df['RET'].rolling(window=3).corr(ticker_df['Score'])
-        
-        # Create figure with 3 subplots
-        fig = plt.figure(figsize=(16, 12))
-        gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
-        
-        # Subplot 1: Raw values (RET as percentage vs Score)
-        ax1 = fig.add_subplot(gs[0, :])
-        color1 = 'tab:blue'
-        ax1.set_xlabel('Date', fontsize=11)
-        ax1.set_ylabel('Monthly RET (%)', color=color1, fontsize=11)
-        line1 = ax1.plot(ticker_df['Date'], ticker_df['RET_pct'], 
-                         color=color1, linewidth=2, marker='o', markersize=4,
-                         label='Monthly Return (%)', alpha=0.7)
-        ax1.tick_params(axis='y', labelcolor=color1)
-        ax1.grid(True, alpha=0.3)
-        ax1.axhline(y=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
-        
-        ax1_twin = ax1.twinx()
-        color2 = 'tab:red'
-        ax1_twin.set_ylabel('Score', color=color2, fontsize=11)
-        line2 = ax1_twin.plot(ticker_df['Date'], ticker_df['Score'], 
-                              color=color2, linewidth=2, marker='s', markersize=4,
-                              label='Avg Score', alpha=0.7)
-        ax1_twin.tick_params(axis='y', labelcolor=color2)
-        ax1_twin.axhline(y=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
-        ax1_twin.set_ylim(-1.1, 1.1)  # Fix Score axis
-        
-        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        ax1.set_title(f'{ticker} - Raw Values: Monthly Returns (%) vs Sentiment Score', fontsize=12, fontweight='bold')
-        
-        lines = line1 + line2
-        labels = [l.get_label() for l in lines]
-        ax1.legend(lines, labels, loc='upper left')
-        
-        # Subplot 2: Normalized values (z-scores)
-        ax2 = fig.add_subplot(gs[1, :])
-        ax2.plot(ticker_df['Date'], ticker_df['RET_normalized'], 
-                color='tab:blue', linewidth=2, marker='o', markersize=4,
-                label='Return (Normalized)', alpha=0.7)
-        ax2.plot(ticker_df['Date'], ticker_df['Score_normalized'], 
-                color='tab:red', linewidth=2, marker='s', markersize=4,
-                label='Score (Normalized)', alpha=0.7)
-        ax2.set_xlabel('Date', fontsize=11)
-        ax2.set_ylabel('Z-Score (Standard Deviations from Mean)', fontsize=11)
-        ax2.grid(True, alpha=0.3)
-        ax2.axhline(y=0, color='gray', linestyle='--', linewidth=0.8)
-        ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        ax2.set_title(f'{ticker} - Normalized Values (Z-Scores)', fontsize=12, fontweight='bold')
-        ax2.legend(loc='upper left')
-        
-        # Subplot 3: Scatter plot with correlation
-        ax3 = fig.add_subplot(gs[2, 0])
-        ax3.scatter(ticker_df['Score'], ticker_df['RET_pct'], 
-                   alpha=0.6, s=80, c=range(len(ticker_df)), cmap='viridis')
-        
-        # Add trend line
-        z = np.polyfit(ticker_df['Score'], ticker_df['RET_pct'], 1)
-        p = np.poly1d(z)
-        ax3.plot(ticker_df['Score'], p(ticker_df['Score']), 
-                "r--", linewidth=2, alpha=0.8, label=f'Trend: y={z[0]:.2f}x+{z[1]:.2f}')
-        
-        ax3.set_xlabel('Score', fontsize=11)
-        ax3.set_ylabel('Monthly RET (%)', fontsize=11)
-        ax3.grid(True, alpha=0.3)
-        ax3.axhline(y=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
-        ax3.axvline(x=0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
-        
-        # Calculate correlation
-        correlation = ticker_df['Score'].corr(ticker_df['RET'])
-        ax3.set_title(f'Scatter Plot (Correlation: {correlation:.3f})', fontsize=12, fontweight='bold')
-        ax3.legend()
-        
-        # Collect statistics for this ticker
-        ticker_stats = {
-            'Ticker': ticker,
-            'Data_Points': len(ticker_df),
-            'Avg_Monthly_RET': ticker_df['RET'].mean(),
-            'Avg_Monthly_RET_Pct': ticker_df['RET'].mean() * 100,
-            'Avg_Score': ticker_df['Score'].mean(),
-            'Correlation': correlation,
-            'Date_Start': ticker_df['Date'].min().strftime('%Y-%m'),
-            'Date_End': ticker_df['Date'].max().strftime('%Y-%m'),
-            'RET_StdDev': ticker_df['RET'].std(),
-            'Score_StdDev': ticker_df['Score'].std(),
-            'Min_RET': ticker_df['RET'].min(),
-            'Max_RET': ticker_df['RET'].max(),
-            'Min_Score': ticker_df['Score'].min(),
-            'Max_Score': ticker_df['Score'].max()
-        }
-        all_stats.append(ticker_stats)
-        
-        # Subplot 4: Rolling correlation
-        ax4 = fig.add_subplot(gs[2, 1])
-        if 'rolling_corr' in ticker_df.columns and not ticker_df['rolling_corr'].isna().all():
-            ax4.plot(ticker_df['Date'], ticker_df['rolling_corr'], 
-                    color='tab:purple', linewidth=2, marker='o', markersize=4)
-            ax4.axhline(y=0, color='gray', linestyle='--', linewidth=0.8)
-            ax4.set_ylim(-1.1, 1.1)
-            ax4.fill_between(ticker_df['Date'], 0, ticker_df['rolling_corr'], 
-                            where=(ticker_df['rolling_corr'] >= 0), 
-                            color='green', alpha=0.3, interpolate=True)
-            ax4.fill_between(ticker_df['Date'], 0, ticker_df['rolling_corr'], 
-                            where=(ticker_df['rolling_corr'] < 0), 
-                            color='red', alpha=0.3, interpolate=True)
-        else:
-            ax4.text(0.5, 0.5, 'Insufficient data\nfor rolling correlation\n(need at least 3 months)', 
-                    ha='center', va='center', fontsize=12, transform=ax4.transAxes)
-        
-        ax4.set_xlabel('Date', fontsize=11)
-        ax4.set_ylabel('Rolling Correlation (3-month window)', fontsize=11)
-        ax4.grid(True, alpha=0.3)
-        ax4.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        ax4.set_title(f'Rolling Correlation Over Time', fontsize=12, fontweight='bold')
-        
-        # Add overall statistics
-        stats_text = f'Monthly Statistics:\n'
-        stats_text += f'Data Points: {len(ticker_df)} months\n'
-        stats_text += f'Avg RET: {ticker_df["RET"].mean()*100:.3f}%\n'
-        stats_text += f'Avg Score: {ticker_df["Score"].mean():.3f}\n'
-        stats_text += f'Correlation: {correlation:.3f}\n'
-        stats_text += f'Date Range:\n{ticker_df["Date"].min().strftime("%Y-%m")} to\n{ticker_df["Date"].max().strftime("%Y-%m")}'
-        
-        fig.text(0.98, 0.02, stats_text, fontsize=9, 
-                verticalalignment='bottom', horizontalalignment='right',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-        
-        # Main title
-        fig.suptitle(f'{ticker} - Monthly Analysis: Returns vs Sentiment Score', 
-                    fontsize=14, fontweight='bold', y=0.995)
-        
-        # Save the plot
-        output_path = os.path.join(output_dir, f'{ticker}_monthly_plot.png')
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        print(f"  ✅ Saved plot to {output_path}")
-        
-        # Close the figure to free memory
-        plt.close(fig)
+    # Render each ticker in a separate process (figures are independent);
+    # map() yields each ticker's output in ticker order
+    ticker_groups = list(grouped)
+    with ProcessPoolExecutor(max_workers=PLOT_WORKERS) as executor:
+        for output in executor.map(
+            capture_plot_output,
+            [plot_single_ticker] * len(ticker_groups),
+            [ticker for ticker, _ in ticker_groups],
+            [ticker_df for _, ticker_df in ticker_groups],
+            stats_df.to_dict('records'),
+            [trend_slope[ticker] for ticker, _ in ticker_groups],
+            [trend_intercept[ticker] for ticker, _ in ticker_groups],
+            [output_dir] * len(ticker_groups),
+        ):
+            print(output, end='')
     
     # Save statistics to CSV
     print(f"\n{'='*60}")
     print(f"Saving statistics to {stats_output_file}...")
-    stats_df = pd.DataFrame(all_stats)
     stats_df.to_csv(stats_output_file, index=False)
     print(f"✅ Saved statistics for {len(stats_df)} tickers")
     
@@ -1,20 +1,64 @@
 # api_client.py
 
 import os
-from groq import Groq
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from groq import Groq, RateLimitError
 from dotenv import load_dotenv
 
 load_dotenv()
 _client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-def call_groq(messages: list, model: str = "qwen/qwen3-32b") -> str:
+# Number of distinct (messages, model) responses kept in memory
+CACHE_SIZE = 4096
+
+# Concurrent requests for call_groq_batch; keep within the account tier's rate limit
+# (requests per minute), otherwise most extra workers just wait in the rate-limit backoff
+BATCH_WORKERS = 16
+
+# Extra attempts after a 429 rate-limit response, with exponential backoff starting at this delay (seconds)
+RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF = 1.0
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _call_groq_cached(message_key: tuple, model: str) -> str:
     """
-    Low-level function to call Groq API and return raw text.
+    Send one request per distinct (messages, model) pair; repeats are served from the cache.
     """
     response = _client.chat.completions.create(
-        messages=messages,
+        messages=[dict(items) for items in message_key],
         model=model,
         temperature=0.0,
         max_tokens=250
     )
-    return (response.choices[0].message.content or "").strip()
\ No newline at end of file
+    return (response.choices[0].message.content or "").strip()
+
+def call_groq(messages: list, model: str = "qwen/qwen3-32b") -> str:
+    """
+    Low-level function to call Groq API and return raw text.
+    Calls are made at temperature 0, so identical requests within a run reuse the first response.
+    """
+    # Hashable, order-independent form of each message dict
+    message_key = tuple(tuple(sorted(message.items())) for message in messages)
+    return _call_groq_cached(message_key, model)
+
+def _call_groq_with_backoff(messages: list, model: str) -> str:
+    """
+    call_groq, retried with exponential backoff while the API answers 429 (rate limited).
+    """
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            return call_groq(messages, model)
+        except RateLimitError:
+            if attempt == RATE_LIMIT_RETRIES:
+                raise
+            time.sleep(RATE_LIMIT_BACKOFF * 2 ** attempt)
+
+def call_groq_batch(batches: list, model: str = "qwen/qwen3-32b", max_workers: int = BATCH_WORKERS) -> list:
+    """
+    Call Groq for many message lists concurrently and return the raw texts in input order.
+    Requests are network-bound, so threads overlap their latency.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda messages: _call_groq_with_backoff(messages, model), batches))
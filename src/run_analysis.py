@@ -3,7 +3,7 @@ import os
 import pandas as pd
 import glob
 import re
-from api_client import call_groq
+from api_client import call_groq_batch
 from prompt_engine import load_system_prompt, build_messages
 from sentiment_analysis import parse_llm_response
 
@@ -41,23 +41,29 @@ def main():
     df = pd.read_csv(DATA_PATH)
     system_prompt = load_system_prompt(PROMPT_PATH)
     
+    # Check if tags column exists
+    has_tags = 'tags' in df.columns
+    
+    # Send every headline up front so the API calls overlap instead of running one at a time
+    batches = [
+        build_messages(system_prompt, row['title'], row['tags'] if has_tags else None)
+        for _, row in df.iterrows()
+    ]
+    raw_outputs = call_groq_batch(batches)
+    
     results = []
-    for idx, row in df.iterrows():
+    for (idx, row), raw_output in zip(df.iterrows(), raw_outputs):
         print(f"\n{'='*80}")
         print(f"Processing {idx+1}/{len(df)}")
         print(f"Ticker: {row['ticker']}")
         print(f"Headline: {row['title']}")
         
-        # Check if tags column exists
-        tags = row.get('tags', None) if 'tags' in df.columns else None
+        tags = row['tags'] if has_tags else None
         if tags:
             print(f"Tags: {tags}")
         
         print(f"{'-'*80}")
         
-        messages = build_messages(system_prompt, row['title'], tags)
-        raw_output = call_groq(messages)
-        
         print(f"🔍 RAW LLM OUTPUT:")
         print(raw_output)
         print(f"{'-'*80}")
@@ -20,7 +20,7 @@ def _date_range(path: Path, date_col: str = "date") -> tuple[pd.Timestamp, pd.Ti
 
 def _prepare_direction(direction_path: Path) -> pd.DataFrame:
     direction = pd.read_csv(direction_path, usecols=["date", "ticker", "sentiment", "news_count"])
-    direction["date"] = pd.to_datetime(direction["date"], errors="coerce").dt.date
+    direction["date"] = pd.to_datetime(direction["date"], errors="coerce").dt.normalize()
     direction["ticker"] = direction["ticker"].astype(str)
     direction["sentiment"] = pd.to_numeric(direction["sentiment"], errors="coerce")
     direction["news_count"] = pd.to_numeric(direction["news_count"], errors="coerce")
@@ -53,7 +53,8 @@ def build_backtest_daily(
     if missing_returns:
         raise KeyError(f"train_return_data_daily missing required columns: {missing_returns}")
 
-    returns["date"] = pd.to_datetime(returns["date"], errors="coerce").dt.date
+    # Dates stay datetime64 (midnight) so the clipping, sort and merge below compare int64 keys.
+    returns["date"] = pd.to_datetime(returns["date"], errors="coerce").dt.normalize()
     returns["ticker"] = returns["ticker"].astype(str)
     before_rows = len(returns)
     returns = returns.dropna(subset=["date", "ticker"])
@@ -61,8 +62,8 @@ def build_backtest_daily(
     if dropped_bad:
         print(f"[returns] dropped {dropped_bad} rows with invalid date/ticker.")
 
-    news_min_date = news_min.date()
-    news_max_date = news_max.date()
+    news_min_date = pd.Timestamp(news_min.date())
+    news_max_date = pd.Timestamp(news_max.date())
     returns = returns[(returns["date"] >= news_min_date) & (returns["date"] <= news_max_date)].copy()
     returns = returns.sort_values(["date", "ticker"]).reset_index(drop=True)
     if returns.empty:
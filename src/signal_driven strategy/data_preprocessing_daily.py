@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import argparse
 from datetime import timedelta
-import warnings
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -20,14 +20,52 @@ def na_row_stats(df: pd.DataFrame) -> tuple[int, pd.Series]:
     return row_count, per_col[per_col > 0].sort_values(ascending=False)
 
 
-def ret_na_cleanup(path: Path, chunksize: int = 500_000) -> tuple[int, int, bool]:
+def _copy_csv_without_rows(path: Path, out_path: Path, drop_rows: np.ndarray, total_rows: int) -> bool:
+    """
+    Copy a CSV line by line, skipping the given 0-based data rows; kept rows are written unchanged.
+    Returns False (out_path left incomplete) if the file does not have exactly one line per
+    data row, e.g. blank lines or quoted fields spanning lines.
+    """
+    drop = np.zeros(total_rows, dtype=bool)
+    drop[drop_rows] = True
+    with path.open("rb") as src, out_path.open("wb") as dst:
+        dst.write(src.readline())
+        row = -1
+        for row, line in enumerate(src):
+            if row >= total_rows:
+                return False
+            if not drop[row]:
+                dst.write(line)
+    return row + 1 == total_rows
+
+
+def read_returns(path: Path, ticker_dtype=None) -> pd.DataFrame:
+    """
+    Parse ticker, date, RET and N_RET from train_return_data_daily in a single pass.
+    Rows stay in file order (nothing is dropped), so positions line up with the file's data rows.
+    """
+    dtype = None
+    if isinstance(ticker_dtype, pd.CategoricalDtype):
+        # Tickers without news become NaN; attach_returns drops them.
+        dtype = {"ticker": ticker_dtype}
+    returns_df = pd.read_csv(path, usecols=["ticker", "date", "RET", "N_RET"], dtype=dtype)
+    returns_df["date"] = pd.to_datetime(returns_df["date"], errors="coerce")
+    return returns_df
+
+
+def ret_na_cleanup(
+    path: Path, ret: pd.Series | None = None, chunksize: int = 500_000
+) -> tuple[int, int, bool]:
     """
     Detect NA values in RET column; if any, drop those rows and overwrite the file.
+    ret may be the file's already-parsed RET column (in file order) to skip re-reading it.
     Returns (na_count, total_rows, cleaned_flag).
     """
-    ret_col = pd.read_csv(path, usecols=["RET"])
-    na_count = int(ret_col["RET"].isna().sum())
-    total_rows = len(ret_col)
+    if ret is None:
+        ret = pd.read_csv(path, usecols=["RET"])["RET"]
+    na_rows = np.flatnonzero(ret.isna().to_numpy())
+    na_count = len(na_rows)
+    total_rows = len(ret)
 
     if na_count == 0:
         return na_count, total_rows, False
@@ -36,12 +74,15 @@ def ret_na_cleanup(path: Path, chunksize: int = 500_000) -> tuple[int, int, bool
     if tmp_path.exists():
         tmp_path.unlink()
 
-    wrote_header = False
-    for chunk in pd.read_csv(path, chunksize=chunksize):
-        mask = chunk["RET"].notna()
-        chunk = chunk.loc[mask]
-        chunk.to_csv(tmp_path, mode="a", index=False, header=not wrote_header)
-        wrote_header = True
+    # The NA rows are already known, so drop their raw lines instead of parsing every column again.
+    if not _copy_csv_without_rows(path, tmp_path, na_rows, total_rows):
+        tmp_path.unlink()
+        wrote_header = False
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            mask = chunk["RET"].notna()
+            chunk = chunk.loc[mask]
+            chunk.to_csv(tmp_path, mode="a", index=False, header=not wrote_header)
+            wrote_header = True
 
     tmp_path.replace(path)
     return na_count, total_rows, True
@@ -61,146 +102,109 @@ def add_next_ret(path: Path) -> tuple[int, int]:
     if "N_RET" in df.columns:
         df = df.drop(columns=["N_RET"])
 
+    df["ticker"] = df["ticker"].astype("category")
     df["date"] = pd.to_datetime(df["date"], errors="coerce")
     df = df.sort_values(["ticker", "date"])
 
-    def _per_ticker(group: pd.DataFrame) -> pd.DataFrame:
-        group = group.sort_values("date")
-        group["N_RET"] = group["RET"].shift(-1)
-        ticker_name = getattr(group, "name", None)
-        if ticker_name is not None:
-            group["ticker"] = ticker_name
-        return group
-
-    grouped = df.groupby("ticker", group_keys=False, sort=True)
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", FutureWarning)
-        processed = grouped.apply(_per_ticker)
-    processed = processed.sort_values(["ticker", "date"])
+    # Rows are already in ticker/date order, so the next row's RET is the next day's RET
+    # except where the ticker changes (or is missing), which ends a group with NA.
+    codes = df["ticker"].cat.codes.to_numpy()
+    ret = df["RET"].to_numpy(dtype=float)
+    n_ret = np.full_like(ret, np.nan)
+    n_ret[:-1] = ret[1:]
+    n_ret[:-1][codes[:-1] != codes[1:]] = np.nan
+    n_ret[codes < 0] = np.nan
+    df["N_RET"] = n_ret
 
-    rows_removed = int(processed["N_RET"].isna().sum())
-    processed = processed.loc[processed["N_RET"].notna()].reset_index(drop=True)
+    rows_removed = int(df["N_RET"].isna().sum())
+    df = df.dropna(subset=["N_RET"]).reset_index(drop=True)
 
-    processed.to_csv(path, index=False)
-    return rows_removed, len(processed)
+    df.to_csv(path, index=False)
+    return rows_removed, len(df)
 
 
 def attach_returns(
-    news_df: pd.DataFrame, returns_path: Path
+    news_df: pd.DataFrame, returns_df: pd.DataFrame
 ) -> pd.DataFrame:
     """
-    Merge RET and N_RET from train_return_data_daily into news_df by ticker/date.
+    Merge RET and N_RET from the returns frame (see read_returns) into news_df by ticker/date.
     """
-    returns_df = pd.read_csv(returns_path, usecols=["ticker", "date", "RET", "N_RET"])
-    returns_df["date"] = pd.to_datetime(returns_df["date"], errors="coerce").dt.date
+    if isinstance(returns_df["ticker"].dtype, pd.CategoricalDtype):
+        returns_df = returns_df.dropna(subset=["ticker"])
     merged = news_df.merge(returns_df, on=["ticker", "date"], how="left")
     return merged
 
 
-def _adjust_na_block(group: pd.DataFrame, start: int, end: int) -> None:
+def clean_return_gaps(news_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Adjust a consecutive NA block for RET and N_RET within a sorted ticker group in place.
+    For each ticker, drop trailing rows where RET and N_RET are NA,
+    then forward-fill NA blocks by aligning to the next available RET/N_RET,
+    adjusting date and delta_t per specified rules.
+
+    Every NA row takes date, RET and N_RET from the next non-NA row of its ticker.
+    Its delta_t is kept only for news within the previous tradable day's 16:00-20:00 ET
+    window; all other NA rows use the 4:00-derived delta_t. Rows already on that next
+    date with news time before 4:00 ET are clamped to the 4:00-derived delta_t as well.
     """
-    prev_idx = start - 1 if start > 0 else None
-    next_idx = end + 1 if end + 1 < len(group) else None
-    if next_idx is None:
-        return
-
-    next_date = group.iloc[next_idx]["date"]
-
-    # Update dates to next available date.
-    block_idx = group.index[start : end + 1]
-    group.loc[block_idx, "date"] = next_date
-
-    # Prepare time windows in ET.
-    o_dt = pd.to_datetime(group.loc[block_idx, "o_date"], utc=True, errors="coerce")
-    o_et = o_dt.dt.tz_convert("America/New_York")
-
-    # Keep original delta_t only for news within previous tradable day's 16:00-20:00 ET window.
-    keep_original_mask = pd.Series(False, index=block_idx, dtype=bool)
-    if prev_idx is not None:
-        prev_date = group.iloc[prev_idx]["date"]
-        prev_start = pd.Timestamp(prev_date).tz_localize("America/New_York") + pd.Timedelta(hours=16)
-        prev_end = pd.Timestamp(prev_date).tz_localize("America/New_York") + pd.Timedelta(hours=20)
-        keep_original_mask = (o_et >= prev_start) & (o_et <= prev_end)
-
-    next_day_start = pd.Timestamp(next_date).tz_localize("America/New_York")
-    next_4am = next_day_start + pd.Timedelta(hours=4)
-    next_close = next_day_start + pd.Timedelta(hours=15, minutes=59, seconds=59)
-    delta_at_4am = (next_close - next_4am).total_seconds()
-
-    # For the missing block itself: keep only prev-day 16:00-20:00; all other rows use 4:00-derived delta_t.
-    force_4am_mask = ~keep_original_mask
-    group.loc[block_idx, "delta_t"] = group.loc[block_idx, "delta_t"].where(
-        ~force_4am_mask, delta_at_4am
-    )
+    df = news_df.sort_values(["ticker", "date"], kind="stable").reset_index(drop=True)
+    mask_na = (df["RET"].isna() & df["N_RET"].isna()).to_numpy()
+
+    # Position of the next / previous non-NA row of the same ticker (NaN when there is none).
+    valid_pos = pd.Series(np.where(mask_na, np.nan, np.arange(len(df))), index=df.index)
+    by_ticker = valid_pos.groupby(df["ticker"], observed=True)
+    next_valid = by_ticker.bfill().to_numpy()
+    prev_valid = by_ticker.ffill().to_numpy()
+
+    # Trailing NA rows have no later return to align to and are dropped.
+    keep = ~np.isnan(next_valid)
+    block = mask_na & keep
+    if block.any():
+        block_idx = np.flatnonzero(block)
+        next_idx = next_valid[block].astype(np.intp)
+        prev_idx = prev_valid[block]
+        has_prev = ~np.isnan(prev_idx)
+
+        # Prepare time windows in ET, as int64 nanoseconds since the epoch. Instants compare the same
+        # in any zone, so only the trading-day midnights need localizing, once per distinct date.
+        # NaT becomes the minimum int64 and falls outside every window below.
+        hour_ns = 3_600 * 10**9
+        o_ns = pd.to_datetime(df["o_date"], utc=True, errors="coerce").to_numpy(dtype="datetime64[ns]").view(np.int64)
+        date_codes, dates = pd.factorize(df["date"])
+        day_start = pd.to_datetime(dates).tz_localize("America/New_York").as_unit("ns").asi8[date_codes]
+        delta_at_4am = (pd.Timedelta(hours=15, minutes=59, seconds=59) - pd.Timedelta(hours=4)).total_seconds()
+
+        # Keep original delta_t only for news within previous tradable day's 16:00-20:00 ET window.
+        prev_start = day_start[np.where(has_prev, prev_idx, 0).astype(np.intp)]
+        block_o_ns = o_ns[block_idx]
+        keep_original = (
+            has_prev
+            & (block_o_ns >= prev_start + 16 * hour_ns)
+            & (block_o_ns <= prev_start + 20 * hour_ns)
+        )
 
-    # For the block right after the missing block (same next_date):
-    # if news time is before 4:00 ET on next_date, clamp to 4:00-derived delta_t.
-    post_start = next_idx
-    post_end = post_start
-    while post_end + 1 < len(group) and group.iloc[post_end + 1]["date"] == next_date:
-        post_end += 1
-
-    post_block_idx = group.index[post_start : post_end + 1]
-    if len(post_block_idx) > 0:
-        post_o_dt = pd.to_datetime(group.loc[post_block_idx, "o_date"], utc=True, errors="coerce")
-        post_o_et = post_o_dt.dt.tz_convert("America/New_York")
-        post_before_4_mask = (post_o_et >= next_day_start) & (post_o_et < next_4am)
-        group.loc[post_block_idx, "delta_t"] = group.loc[post_block_idx, "delta_t"].where(
-            ~post_before_4_mask, delta_at_4am
+        # For the rows right after each block (same next date):
+        # if news time is before 4:00 ET on that date, clamp to 4:00-derived delta_t.
+        day_id = df.groupby(["ticker", "date"], observed=True, sort=False).ngroup().to_numpy()
+        post = (
+            ~mask_na
+            & np.isin(day_id, day_id[next_idx])
+            & (o_ns >= day_start)
+            & (o_ns < day_start + 4 * hour_ns)
         )
 
-    next_ret = group.iloc[next_idx]["RET"]
-    next_n_ret = group.iloc[next_idx]["N_RET"]
-    group.loc[block_idx, ["RET", "N_RET"]] = [next_ret, next_n_ret]
+        delta_t = df["delta_t"].to_numpy(dtype=float, copy=True)
+        delta_t[block_idx[~keep_original]] = delta_at_4am
+        delta_t[post] = delta_at_4am
+        df["delta_t"] = delta_t
 
+        # Update dates and returns to the next available row.
+        for col in ["date", "RET", "N_RET"]:
+            values = df[col].to_numpy(copy=True)
+            values[block_idx] = values[next_idx]
+            df[col] = values
 
-def clean_return_gaps(news_df: pd.DataFrame) -> pd.DataFrame:
-    """
-    For each ticker, drop trailing rows where RET and N_RET are NA,
-    then forward-fill NA blocks by aligning to the next available RET/N_RET,
-    adjusting date and delta_t per specified rules.
-    """
-    def _clean_group(group: pd.DataFrame) -> pd.DataFrame:
-        group = group.sort_values("date").reset_index(drop=True)
-        mask_na = group["RET"].isna() & group["N_RET"].isna()
-        # Drop trailing NA block
-        tail_len = 0
-        for v in mask_na.iloc[::-1]:
-            if v:
-                tail_len += 1
-            else:
-                break
-        if tail_len:
-            group = group.iloc[: -tail_len]
-            mask_na = group["RET"].isna() & group["N_RET"].isna()
-
-        if not mask_na.any():
-            return group
-
-        i = 0
-        n = len(group)
-        mask_na_vals = mask_na.to_list()
-        while i < n:
-            if not mask_na_vals[i]:
-                i += 1
-                continue
-            start = i
-            while i < n and mask_na_vals[i]:
-                i += 1
-            end = i - 1
-            _adjust_na_block(group, start, end)
-            mask_na_vals = (group["RET"].isna() & group["N_RET"].isna()).to_list()
-            n = len(group)
-        return group
-
-    grouped = news_df.groupby("ticker", group_keys=False)
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", FutureWarning)
-        cleaned = grouped.apply(_clean_group)
-    cleaned = cleaned.sort_values(["ticker", "date"]).reset_index(drop=True)
-    return cleaned
+    # Block rows sit right before the date they were moved to, so the frame stays in ticker/date order.
+    return df.loc[keep].reset_index(drop=True)
 
 
 def merge_sentiment(
@@ -222,7 +226,15 @@ def merge_sentiment(
     if chosen is None:
         raise FileNotFoundError("No sentiment score file found.")
 
-    sentiment_df = pd.read_csv(chosen, sep=None, engine="python")
+    # Pick the delimiter from the header line so the file is parsed by the C engine;
+    # only a header with neither ';' nor ',' falls back to the Python engine's sniffing.
+    with open(chosen, "rb") as f:
+        header = f.readline()
+    n_semicolon, n_comma = header.count(b";"), header.count(b",")
+    if n_semicolon or n_comma:
+        sentiment_df = pd.read_csv(chosen, sep=";" if n_semicolon > n_comma else ",")
+    else:
+        sentiment_df = pd.read_csv(chosen, sep=None, engine="python")
     sentiment_df.columns = [c.strip().lstrip("\ufeff") for c in sentiment_df.columns]
     required = ["ticker", "date", "sentiment"]
     if not set(required).issubset(sentiment_df.columns):
@@ -238,6 +250,9 @@ def merge_sentiment(
             raise KeyError("Sentiment file missing required columns.")
 
     sentiment_df = sentiment_df[required]
+    if pd.api.types.is_datetime64_dtype(df["date"]):
+        # Match the datetime64 trading days from bucket_dates so the join runs on native datetime keys.
+        sentiment_df["date"] = pd.to_datetime(sentiment_df["date"], errors="coerce").dt.normalize()
     merged = df.merge(sentiment_df, on=["ticker", "date"], how="left")
     missing = int(merged["sentiment"].isna().sum())
     merged = merged.dropna(subset=["sentiment"])
@@ -251,22 +266,23 @@ def bucket_dates(df: pd.DataFrame) -> pd.DataFrame:
     (t-1 16:00 ET, t 15:59:59 ET] -> t day.
     Also compute delta_t (seconds) from headline time to 16:00:00 ET of that t day.
     """
-    bucketed = df.copy()
-    bucketed["o_date"] = bucketed["date"].copy()
-    bucketed["date"] = pd.to_datetime(bucketed["date"], utc=True, errors="coerce")
+    parsed = pd.to_datetime(df["date"], utc=True, errors="coerce")
 
-    if bucketed["date"].isna().any():
-        bad_rows = bucketed[bucketed["date"].isna()]
+    if parsed.isna().any():
+        bad_rows = df[parsed.isna()]
         raise ValueError(f"Found non-parsable dates in rows: {bad_rows.index.tolist()}")
 
-    bucketed["date_et"] = bucketed["date"].dt.tz_convert("America/New_York")
-    t_day = (bucketed["date_et"] + timedelta(hours=8)).dt.date
-    close_dt = pd.to_datetime(t_day).dt.tz_localize("America/New_York") + timedelta(
-        hours=16
+    date_et = parsed.dt.tz_convert("America/New_York")
+    # Trading day kept as a datetime64 midnight (ET wall clock) rather than Python date objects,
+    # so the merges and groupbys downstream work on native datetime keys.
+    t_day = (date_et + timedelta(hours=8)).dt.tz_localize(None).dt.normalize()
+    close_dt = t_day.dt.tz_localize("America/New_York") + timedelta(hours=16)
+    # assign() builds the new frame without an extra full copy of the input.
+    return df.assign(
+        o_date=df["date"],
+        date=t_day,
+        delta_t=(close_dt - date_et).dt.total_seconds(),
     )
-    bucketed["delta_t"] = (close_dt - bucketed["date_et"]).dt.total_seconds()
-    bucketed["date"] = t_day
-    return bucketed.drop(columns=["date_et"])
 
 
 def duplicate_ticker_date_counts(df: pd.DataFrame) -> pd.Series:
@@ -277,7 +293,7 @@ def duplicate_ticker_date_counts(df: pd.DataFrame) -> pd.Series:
     if not required_cols.issubset(df.columns):
         return pd.Series(dtype=int)
 
-    counts = df.groupby(["ticker", "date"]).size()
+    counts = df.groupby(["ticker", "date"], observed=True).size()
     dup_counts = counts[counts > 1]
     return dup_counts.sort_index()
 
@@ -312,7 +328,7 @@ def fuse_sentiment_direction(df: pd.DataFrame) -> pd.DataFrame:
     fused["weighted_sentiment"] = fused["sentiment"].fillna(0.0) * fused["effective_weight"]
 
     grouped = (
-        fused.groupby(["ticker", "date"], as_index=False, sort=True)
+        fused.groupby(["ticker", "date"], as_index=False, observed=True, sort=True)
         .agg(
             weighted_sentiment_sum=("weighted_sentiment", "sum"),
             weight_sum=("effective_weight", "sum"),
@@ -351,12 +367,18 @@ def preprocess_train_df(input_path: Path, output_path: Path) -> pd.DataFrame:
 
     # Drop unused columns early to keep output lean.
     df = df[["ticker", "date", "sentiment"]].copy()
+    # Categorical tickers; read_returns parses the return tickers into the same categories.
+    df["ticker"] = df["ticker"].astype("category")
     na_rows, na_cols = na_row_stats(df)
     df = df.reset_index(drop=True)
 
     ret_path = DATA_DIR / "train_return_data_daily.csv"
+    # The returns file is parsed once; the NA check and the merge below share this frame.
+    returns_df = None
     try:
-        ret_na, ret_total, cleaned = ret_na_cleanup(ret_path)
+        returns_df = read_returns(ret_path, df["ticker"].dtype)
+        ret_na, ret_total, cleaned = ret_na_cleanup(ret_path, returns_df["RET"])
+        returns_df = returns_df.dropna(subset=["RET"])
         if ret_na:
             print(f"train_return_data_daily RET NA count: {ret_na} out of {ret_total} rows.")
             if cleaned:
@@ -371,13 +393,14 @@ def preprocess_train_df(input_path: Path, output_path: Path) -> pd.DataFrame:
 
     bucketed = bucket_dates(df)
 
-    try:
-        bucketed = attach_returns(bucketed, ret_path)
-        bucketed = clean_return_gaps(bucketed)
-    except FileNotFoundError:
+    if returns_df is None:
         print("train_return_data_daily.csv not found; skipped RET/N_RET merge.")
-    except KeyError as e:
-        print(f"{e}; skipped RET/N_RET merge and cleaning.")
+    else:
+        try:
+            bucketed = attach_returns(bucketed, returns_df)
+            bucketed = clean_return_gaps(bucketed)
+        except KeyError as e:
+            print(f"{e}; skipped RET/N_RET merge and cleaning.")
 
     dup_counts = duplicate_ticker_date_counts(bucketed)
 
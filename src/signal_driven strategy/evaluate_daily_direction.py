@@ -73,8 +73,7 @@ def compute_backtest_metrics(
     if missing := required - set(daily_df.columns):
         raise KeyError(f"{strategy_name} daily records missing columns: {missing}")
 
-    d = daily_df.copy()
-    d = d.dropna(subset=["date", "daily_return", "capital_start", "capital_end"]).sort_values("date").reset_index(drop=True)
+    d = daily_df.dropna(subset=["date", "daily_return", "capital_start", "capital_end"]).sort_values("date").reset_index(drop=True)
     if d.empty:
         return {"strategy": strategy_name, "total_days": 0}
 
@@ -121,7 +120,7 @@ def build_signal_component_curves(
     signal_daily: pd.DataFrame,
     signal_positions: pd.DataFrame,
 ) -> pd.DataFrame:
-    base = signal_daily[["date", "daily_return", "capital_start", "capital_end"]].copy()
+    base = signal_daily[["date", "daily_return", "capital_start", "capital_end"]]
     base = base.dropna(subset=["date"]).sort_values("date").reset_index(drop=True)
     if base.empty:
         return pd.DataFrame(columns=["date", "signal_total", "signal_long_only", "signal_short_only"])
@@ -140,13 +139,23 @@ def build_signal_component_curves(
         .reindex(all_dates, fill_value=0.0)
     )
 
+    # Compound the total/long/short return series together in one cumprod over a (days, 3) array.
+    daily = np.column_stack(
+        [
+            pd.to_numeric(base["daily_return"], errors="coerce").fillna(0.0).to_numpy(dtype=float),
+            long_daily.to_numpy(dtype=float),
+            short_daily.to_numpy(dtype=float),
+        ]
+    )
+    cumulative = np.cumprod(1.0 + daily, axis=0) - 1.0
+
     out = pd.DataFrame({"date": all_dates.to_list()})
-    out["signal_total_daily"] = pd.to_numeric(base["daily_return"], errors="coerce").fillna(0.0).to_numpy()
-    out["signal_long_daily"] = long_daily.to_numpy()
-    out["signal_short_daily"] = short_daily.to_numpy()
-    out["signal_total"] = (1.0 + out["signal_total_daily"]).cumprod() - 1.0
-    out["signal_long_only"] = (1.0 + out["signal_long_daily"]).cumprod() - 1.0
-    out["signal_short_only"] = (1.0 + out["signal_short_daily"]).cumprod() - 1.0
+    out["signal_total_daily"] = daily[:, 0]
+    out["signal_long_daily"] = daily[:, 1]
+    out["signal_short_daily"] = daily[:, 2]
+    out["signal_total"] = cumulative[:, 0]
+    out["signal_long_only"] = cumulative[:, 1]
+    out["signal_short_only"] = cumulative[:, 2]
     return out
 
 
@@ -3,6 +3,9 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+import matplotlib
+
+matplotlib.use("Agg")  # Figures are only written to files.
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -26,9 +29,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 RESULTS_DIR = BASE_DIR / "outputs" / "strategy_daily_direction"
 PLOTS_DIR = RESULTS_DIR / "plots"
 
+# zlib level for PNG encoding (Pillow's default); 1 encodes faster at the cost of larger files.
+PNG_COMPRESS_LEVEL = 6
+
 
 def build_curve_frame(data: dict[str, pd.DataFrame]) -> pd.DataFrame:
-    summary = data["summary"][["date", "signal_threshold_cum_return", "equal_weight_hold_cum_return"]].copy()
+    summary = data["summary"][["date", "signal_threshold_cum_return", "equal_weight_hold_cum_return"]]
     summary = summary.rename(
         columns={
             "signal_threshold_cum_return": "signal_total",
@@ -50,7 +56,24 @@ def build_curve_frame(data: dict[str, pd.DataFrame]) -> pd.DataFrame:
     return merged
 
 
-def plot_cumulative_curves(curves: pd.DataFrame, out_path: Path) -> None:
+def _save_figure(
+    fig: plt.Figure,
+    out_path: Path,
+    dpi: float,
+    png_compress_level: int = PNG_COMPRESS_LEVEL,
+    **savefig_kwargs,
+) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(out_path, dpi=dpi, pil_kwargs={"compress_level": png_compress_level}, **savefig_kwargs)
+    plt.close(fig)
+
+
+def plot_cumulative_curves(
+    curves: pd.DataFrame,
+    out_path: Path,
+    dpi: float | None = None,
+    png_compress_level: int = PNG_COMPRESS_LEVEL,
+) -> None:
     fig, ax = plt.subplots(figsize=(12, 5))
     ax.plot(curves["date"], curves["signal_total"], label="Signal Strategy (Total)", linewidth=2.2)
     ax.plot(curves["date"], curves["equal_weight_hold_total"], label="Equal-Weight Hold (Total)", linewidth=2.2)
@@ -63,12 +86,16 @@ def plot_cumulative_curves(curves: pd.DataFrame, out_path: Path) -> None:
     ax.legend()
     fig.autofmt_xdate()
     fig.tight_layout()
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out_path, dpi=160)
-    plt.close(fig)
+    _save_figure(fig, out_path, dpi or 160, png_compress_level)
 
 
-def plot_daily_returns(signal_daily: pd.DataFrame, hold_daily: pd.DataFrame, out_path: Path) -> None:
+def plot_daily_returns(
+    signal_daily: pd.DataFrame,
+    hold_daily: pd.DataFrame,
+    out_path: Path,
+    dpi: float | None = None,
+    png_compress_level: int = PNG_COMPRESS_LEVEL,
+) -> None:
     merged = signal_daily[["date", "daily_return"]].rename(columns={"daily_return": "signal_daily_return"})
     merged = merged.merge(
         hold_daily[["date", "daily_return"]].rename(columns={"daily_return": "hold_daily_return"}),
@@ -88,13 +115,16 @@ def plot_daily_returns(signal_daily: pd.DataFrame, hold_daily: pd.DataFrame, out
     ax.legend()
     fig.autofmt_xdate()
     fig.tight_layout()
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out_path, dpi=160)
-    plt.close(fig)
+    _save_figure(fig, out_path, dpi or 160, png_compress_level)
 
 
-def plot_signal_structure(signal_daily: pd.DataFrame, out_path: Path) -> None:
-    d = signal_daily[["date", "long_exposure", "short_exposure", "n_long", "n_short"]].copy().sort_values("date")
+def plot_signal_structure(
+    signal_daily: pd.DataFrame,
+    out_path: Path,
+    dpi: float | None = None,
+    png_compress_level: int = PNG_COMPRESS_LEVEL,
+) -> None:
+    d = signal_daily[["date", "long_exposure", "short_exposure", "n_long", "n_short"]].sort_values("date")
 
     fig, axes = plt.subplots(2, 1, figsize=(12, 7), sharex=True)
 
@@ -115,9 +145,7 @@ def plot_signal_structure(signal_daily: pd.DataFrame, out_path: Path) -> None:
 
     fig.autofmt_xdate()
     fig.tight_layout()
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out_path, dpi=160)
-    plt.close(fig)
+    _save_figure(fig, out_path, dpi or 160, png_compress_level)
 
 
 def load_or_build_annualized_table(
@@ -162,7 +190,12 @@ def _format_metric_value(metric: str, value: float, is_diff: bool = False) -> st
     return f"{value:.3f}"
 
 
-def plot_annualized_comparison_table(table_df: pd.DataFrame, out_path: Path) -> None:
+def plot_annualized_comparison_table(
+    table_df: pd.DataFrame,
+    out_path: Path,
+    dpi: float | None = None,
+    png_compress_level: int = PNG_COMPRESS_LEVEL,
+) -> None:
     display_df = table_df.copy()
     display_df["Signal Strategy"] = [
         _format_metric_value(m, v) for m, v in zip(display_df["Metric"], display_df["Signal Strategy"])
@@ -210,9 +243,7 @@ def plot_annualized_comparison_table(table_df: pd.DataFrame, out_path: Path) ->
         pad=18,
     )
     fig.tight_layout()
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out_path, dpi=180, bbox_inches="tight")
-    plt.close(fig)
+    _save_figure(fig, out_path, dpi or 180, png_compress_level, bbox_inches="tight")
 
 
 def parse_args() -> argparse.Namespace:
@@ -231,6 +262,19 @@ def parse_args() -> argparse.Namespace:
         default=PLOTS_DIR,
         help="Directory to save plots.",
     )
+    parser.add_argument(
+        "--dpi",
+        type=float,
+        default=None,
+        help="Resolution for all plots (default: 160, 180 for the metrics table); e.g. 100 for quick drafts.",
+    )
+    parser.add_argument(
+        "--png-compress-level",
+        type=int,
+        default=PNG_COMPRESS_LEVEL,
+        choices=range(10),
+        help="PNG zlib compression level 0-9; 1 saves faster but writes larger files.",
+    )
     return parser.parse_args()
 
 
@@ -248,12 +292,13 @@ def main() -> None:
     annualized_table_csv = args.outdir / "annualized_metrics_comparison.csv"
     annualized_table_plot = args.outdir / "annualized_metrics_comparison_table.png"
 
-    plot_cumulative_curves(curves, curve_plot)
-    plot_daily_returns(data["signal_daily"], data["hold_daily"], daily_ret_plot)
-    plot_signal_structure(data["signal_daily"], structure_plot)
+    save_opts = {"dpi": args.dpi, "png_compress_level": args.png_compress_level}
+    plot_cumulative_curves(curves, curve_plot, **save_opts)
+    plot_daily_returns(data["signal_daily"], data["hold_daily"], daily_ret_plot, **save_opts)
+    plot_signal_structure(data["signal_daily"], structure_plot, **save_opts)
     annualized_table_df = load_or_build_annualized_table(data, args.results_dir)
     annualized_table_df.to_csv(annualized_table_csv, index=False, float_format="%.8f")
-    plot_annualized_comparison_table(annualized_table_df, annualized_table_plot)
+    plot_annualized_comparison_table(annualized_table_df, annualized_table_plot, **save_opts)
 
     print(f"Saved curves csv: {curves_csv}")
     print(f"Saved annualized table csv: {annualized_table_csv}")
@@ -28,71 +28,36 @@ def load_direction_data(path: Path) -> pd.DataFrame:
     return out
 
 
-def _signal_positions_for_day(
-    day_df: pd.DataFrame,
-    threshold: float,
-    long_short_long_exposure: float,
-    long_short_short_exposure: float,
-    long_only_exposure: float,
-) -> tuple[pd.DataFrame, dict]:
-    long_mask = day_df["sentiment"] > threshold
-    short_mask = day_df["sentiment"] < -threshold
-
-    long_df = day_df.loc[long_mask].copy()
-    short_df = day_df.loc[short_mask].copy()
-    n_long = len(long_df)
-    n_short = len(short_df)
-
-    if n_long > 0 and n_short > 0:
-        mode = "long_short"
-        long_weight = long_short_long_exposure / n_long
-        short_weight = -long_short_short_exposure / n_short
-    elif n_long > 0 and n_short == 0:
-        mode = "long_only"
-        long_weight = long_only_exposure / n_long
-        short_weight = 0.0
-    else:
-        mode = "flat"
-        long_weight = 0.0
-        short_weight = 0.0
-
-    pos_frames: list[pd.DataFrame] = []
-    if long_weight != 0.0:
-        long_df["weight"] = long_weight
-        long_df["side"] = "long"
-        pos_frames.append(long_df)
-    if short_weight != 0.0:
-        short_df["weight"] = short_weight
-        short_df["side"] = "short"
-        pos_frames.append(short_df)
-
-    if pos_frames:
-        positions = pd.concat(pos_frames, axis=0, ignore_index=True)
-        positions["contribution"] = positions["weight"] * positions["N_RET"]
-    else:
-        positions = pd.DataFrame(columns=["date", "ticker", "sentiment", "N_RET", "weight", "side", "contribution"])
-
-    if positions.empty:
-        long_exposure = 0.0
-        short_exposure = 0.0
-        net_exposure = 0.0
-        gross_exposure = 0.0
-    else:
-        long_exposure = float(positions.loc[positions["weight"] > 0, "weight"].sum())
-        short_exposure = float(positions.loc[positions["weight"] < 0, "weight"].sum())
-        net_exposure = float(positions["weight"].sum())
-        gross_exposure = float(positions["weight"].abs().sum())
-
-    summary = {
-        "mode": mode,
-        "n_long": n_long,
-        "n_short": n_short,
-        "long_exposure": long_exposure,
-        "short_exposure": short_exposure,
-        "net_exposure": net_exposure,
-        "gross_exposure": gross_exposure,
-    }
-    return positions, summary
+def _day_sums(values: np.ndarray, day_codes: np.ndarray, n_days: int) -> np.ndarray:
+    """
+    Sum values per day, where day_codes is sorted so each day's rows are contiguous.
+    Days without rows get 0.0.
+    """
+    sums = np.zeros(n_days, dtype=float)
+    starts = np.searchsorted(day_codes, np.arange(n_days))
+    has_rows = np.bincount(day_codes, minlength=n_days) > 0
+    if has_rows.any():
+        sums[has_rows] = np.add.reduceat(values, starts[has_rows])
+    return sums
+
+
+def _compound_capital(
+    daily_return: np.ndarray, initial_capital: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Apply each day's return to the running capital.
+    Returns preallocated (capital_start, pnl, capital_end) arrays, one entry per day.
+    """
+    capital_start = np.empty(len(daily_return))
+    pnl = np.empty(len(daily_return))
+    capital_end = np.empty(len(daily_return))
+    capital = float(initial_capital)
+    for i, r in enumerate(daily_return.tolist()):
+        capital_start[i] = capital
+        pnl[i] = capital * r
+        capital = capital + pnl[i]
+        capital_end[i] = capital
+    return capital_start, pnl, capital_end
 
 
 def run_signal_strategy(
@@ -103,52 +68,78 @@ def run_signal_strategy(
     long_only_exposure: float,
     initial_capital: float,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    capital = float(initial_capital)
-    daily_records: list[dict] = []
-    all_positions: list[pd.DataFrame] = []
-
-    for date, day_df in df.groupby("date", sort=True):
-        capital_start = capital
-        day_df = day_df.sort_values("ticker").reset_index(drop=True)
-        positions, summary = _signal_positions_for_day(
-            day_df=day_df,
-            threshold=threshold,
-            long_short_long_exposure=long_short_long_exposure,
-            long_short_short_exposure=long_short_short_exposure,
-            long_only_exposure=long_only_exposure,
-        )
+    """
+    Each day, go long names with sentiment > threshold and short names with sentiment < -threshold
+    (long-only exposure when there are no shorts, flat when there are no longs).
+    Per-day counts, weights and sums are computed for all days at once; only the capital
+    compounding runs day by day.
+    """
+    d = df.sort_values(["date", "ticker"], kind="stable").reset_index(drop=True)
+    if d.empty:
+        return pd.DataFrame(), pd.DataFrame()
 
-        if positions.empty:
-            daily_return = 0.0
-        else:
-            daily_return = float(positions["contribution"].sum())
-            positions.insert(0, "strategy", "signal_threshold")
-            all_positions.append(positions)
-
-        pnl = capital_start * daily_return
-        capital = capital_start + pnl
-
-        daily_records.append(
-            {
-                "date": date,
-                "strategy": "signal_threshold",
-                "mode": summary["mode"],
-                "universe_size": int(len(day_df)),
-                "n_long": int(summary["n_long"]),
-                "n_short": int(summary["n_short"]),
-                "long_exposure": summary["long_exposure"],
-                "short_exposure": summary["short_exposure"],
-                "net_exposure": summary["net_exposure"],
-                "gross_exposure": summary["gross_exposure"],
-                "daily_return": daily_return,
-                "capital_start": capital_start,
-                "pnl": pnl,
-                "capital_end": capital,
-            }
+    day_codes, dates = pd.factorize(d["date"], sort=True)
+    n_days = len(dates)
+    sentiment = d["sentiment"].to_numpy(dtype=float)
+    long_mask = sentiment > threshold
+    short_mask = sentiment < -threshold
+
+    universe_size = np.bincount(day_codes, minlength=n_days)
+    n_long = np.bincount(day_codes[long_mask], minlength=n_days)
+    n_short = np.bincount(day_codes[short_mask], minlength=n_days)
+
+    is_long_short = (n_long > 0) & (n_short > 0)
+    is_long_only = (n_long > 0) & (n_short == 0)
+    mode = np.where(is_long_short, "long_short", np.where(is_long_only, "long_only", "flat"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        long_weight = np.where(
+            is_long_short,
+            long_short_long_exposure / n_long,
+            np.where(is_long_only, long_only_exposure / n_long, 0.0),
         )
+        short_weight = np.where(is_long_short, -long_short_short_exposure / n_short, 0.0)
+
+    # Positions: each day's longs, then its shorts, both in ticker order.
+    row_weight = np.where(long_mask, long_weight[day_codes], np.where(short_mask, short_weight[day_codes], 0.0))
+    held = np.flatnonzero(row_weight != 0.0)
+    held = held[np.lexsort((short_mask[held], day_codes[held]))]
+    weight = row_weight[held]
+    pos_codes = day_codes[held]
 
-    daily_df = pd.DataFrame(daily_records)
-    pos_df = pd.concat(all_positions, axis=0, ignore_index=True) if all_positions else pd.DataFrame()
+    positions = d.iloc[held].reset_index(drop=True)
+    positions["weight"] = weight
+    positions["side"] = np.where(short_mask[held], "short", "long")
+    positions["contribution"] = positions["weight"] * positions["N_RET"]
+    positions.insert(0, "strategy", "signal_threshold")
+
+    contribution = positions["contribution"].to_numpy()
+    daily_return = _day_sums(np.where(np.isnan(contribution), 0.0, contribution), pos_codes, n_days)
+    long_exposure = _day_sums(weight[weight > 0], pos_codes[weight > 0], n_days)
+    short_exposure = _day_sums(weight[weight < 0], pos_codes[weight < 0], n_days)
+    net_exposure = _day_sums(weight, pos_codes, n_days)
+    gross_exposure = _day_sums(np.abs(weight), pos_codes, n_days)
+
+    capital_start, pnl, capital_end = _compound_capital(daily_return, initial_capital)
+
+    daily_df = pd.DataFrame(
+        {
+            "date": dates,
+            "strategy": "signal_threshold",
+            "mode": mode,
+            "universe_size": universe_size,
+            "n_long": n_long,
+            "n_short": n_short,
+            "long_exposure": long_exposure,
+            "short_exposure": short_exposure,
+            "net_exposure": net_exposure,
+            "gross_exposure": gross_exposure,
+            "daily_return": daily_return,
+            "capital_start": capital_start,
+            "pnl": pnl,
+            "capital_end": capital_end,
+        }
+    )
+    pos_df = positions if not positions.empty else pd.DataFrame()
     return daily_df, pos_df
 
 
@@ -156,7 +147,6 @@ def run_equal_weight_hold_strategy(
     df: pd.DataFrame,
     initial_capital: float,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    capital = float(initial_capital)
     base = (
         df[["date", "ticker", "sentiment", "N_RET"]]
         .groupby(["date", "ticker"], as_index=False)
@@ -185,37 +175,29 @@ def run_equal_weight_hold_strategy(
     positions["contribution"] = positions["weight"] * positions["N_RET"]
     positions.insert(0, "strategy", "equal_weight_hold")
 
-    daily_ret = positions.groupby("date", as_index=False)["contribution"].sum().rename(columns={"contribution": "daily_return"})
-    universe_size_map = base.groupby("date")["ticker"].nunique().to_dict()
-
-    daily_records: list[dict] = []
-    for _, row in daily_ret.sort_values("date").iterrows():
-        date = row["date"]
-        daily_return = float(row["daily_return"])
-        capital_start = capital
-        pnl = capital_start * daily_return
-        capital = capital_start + pnl
-
-        daily_records.append(
-            {
-                "date": date,
-                "strategy": "equal_weight_hold",
-                "mode": "buy_and_hold_long",
-                "universe_size": int(universe_size_map.get(date, 0)),
-                "n_long": int(n_init),
-                "n_short": 0,
-                "long_exposure": 1.0,
-                "short_exposure": 0.0,
-                "net_exposure": 1.0,
-                "gross_exposure": 1.0,
-                "daily_return": daily_return,
-                "capital_start": capital_start,
-                "pnl": pnl,
-                "capital_end": capital,
-            }
-        )
-
-    daily_df = pd.DataFrame(daily_records)
+    daily_ret = positions.groupby("date", sort=True)["contribution"].sum()
+    daily_return = daily_ret.to_numpy(dtype=float)
+    universe_size = base.groupby("date")["ticker"].nunique().reindex(daily_ret.index, fill_value=0)
+    capital_start, pnl, capital_end = _compound_capital(daily_return, initial_capital)
+
+    daily_df = pd.DataFrame(
+        {
+            "date": daily_ret.index,
+            "strategy": "equal_weight_hold",
+            "mode": "buy_and_hold_long",
+            "universe_size": universe_size.to_numpy(),
+            "n_long": int(n_init),
+            "n_short": 0,
+            "long_exposure": 1.0,
+            "short_exposure": 0.0,
+            "net_exposure": 1.0,
+            "gross_exposure": 1.0,
+            "daily_return": daily_return,
+            "capital_start": capital_start,
+            "pnl": pnl,
+            "capital_end": capital_end,
+        }
+    )
     pos_df = positions.reset_index(drop=True)
     return daily_df, pos_df
 